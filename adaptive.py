@@ -0,0 +1,191 @@
+# Attention Dynamics - Adaptive PDA Evaluation
+# Computerized adaptive testing for the PDA tab. Each item gets a Rasch
+# difficulty estimated from the response log; the examinee's ability is a
+# grid posterior updated after every answer. The next item is the most
+# informative unused one, and the session stops as soon as the result band
+# is known with the requested confidence (or the fixed length is reached).
+
+import bisect
+import math
+import random
+
+from quiz_engine import PDA_BANDS, PDA_SESSION_LENGTH, PdaSession, Result, pda_band
+from response_log import KIND_PDA
+
+GRID_POINTS = 81
+GRID = tuple(-4.0 + 8.0 * i / (GRID_POINTS - 1) for i in range(GRID_POINTS))
+PRIOR_SD = 1.0
+CONFIDENCE = 0.90       # posterior mass the band decision must reach to stop
+MIN_ITEMS = 5
+EXPOSURE_TOP_K = 3      # pick among the k most informative items so sessions differ
+MAX_DIFFICULTY = 4.0
+
+
+def rasch_p(theta, b):
+    """Probability of a correct answer at ability ``theta`` on an item of difficulty ``b``."""
+    return 1.0 / (1.0 + math.exp(b - theta))
+
+
+def band_index(percent):
+    """0 for the top PDA band, 1 for the middle one, 2 for the lowest."""
+    for i, cutoff in enumerate(PDA_BANDS):
+        if percent >= cutoff:
+            return i
+    return len(PDA_BANDS)
+
+
+class ItemInformationIndex:
+    """Item difficulties kept sorted, so the most informative item is a bisection away.
+
+    Under the Rasch model an item's information p(1 - p) peaks where its
+    difficulty equals the ability, so the best unused item is the nearest
+    difficulty on either side of the current estimate.
+    """
+
+    def __init__(self, difficulties):
+        self.difficulties = list(difficulties)
+        self._order = sorted(range(len(self.difficulties)), key=self.difficulties.__getitem__)
+        self._keys = [self.difficulties[i] for i in self._order]
+        # Expected percent score on the whole bank at each grid ability; the
+        # PDA bands are cut on this scale, like the fixed test's percent.
+        self.grid_percent = [self.expected_percent(theta) for theta in GRID]
+        self.grid_band = [band_index(p) for p in self.grid_percent]
+
+    def __len__(self):
+        return len(self.difficulties)
+
+    @classmethod
+    def from_log(cls, n, log, kind=KIND_PDA):
+        """Difficulties from smoothed correct rates; unseen items start at 0."""
+        difficulties = []
+        for idx in range(n):
+            stats = log.stats(kind, idx) if log is not None else None
+            attempts, correct = (stats.attempts, stats.correct) if stats else (0, 0)
+            p = (correct + 1) / (attempts + 2)
+            b = math.log((1 - p) / p)
+            difficulties.append(max(-MAX_DIFFICULTY, min(MAX_DIFFICULTY, b)))
+        return cls(difficulties)
+
+    def expected_percent(self, theta):
+        if not self.difficulties:
+            return 0.0
+        return 100.0 * sum(rasch_p(theta, b) for b in self.difficulties) / len(self.difficulties)
+
+    def percent_at(self, theta):
+        """``expected_percent`` interpolated from the grid, O(1) in the bank size."""
+        pos = (theta - GRID[0]) / (GRID[1] - GRID[0])
+        i = min(max(int(pos), 0), GRID_POINTS - 2)
+        frac = min(max(pos - i, 0.0), 1.0)
+        return self.grid_percent[i] + frac * (self.grid_percent[i + 1] - self.grid_percent[i])
+
+    def best(self, theta, used, rng=None, k=EXPOSURE_TOP_K, cluster_of=None):
+        """An unused item among the ``k`` most informative at ``theta``.
+
+        ``cluster_of`` maps an index to every index in its near-duplicate
+        cluster (``WeightedSampler.cluster_of``); once one member is used the
+        rest of its cluster is skipped too.
+        """
+        if cluster_of:
+            used = {member for idx in used for member in cluster_of.get(idx, (idx,))}
+        keys, order = self._keys, self._order
+        hi = bisect.bisect_left(keys, theta)
+        lo = hi - 1
+        picks = []
+        while len(picks) < k and (lo >= 0 or hi < len(keys)):
+            if hi >= len(keys) or (lo >= 0 and theta - keys[lo] <= keys[hi] - theta):
+                idx, lo = order[lo], lo - 1
+            else:
+                idx, hi = order[hi], hi + 1
+            if idx not in used:
+                picks.append(idx)
+        if not picks:
+            return None
+        return (rng or random).choice(picks)
+
+
+class AbilityEstimate:
+    """Posterior over ability on a fixed grid, starting from a normal prior."""
+
+    __slots__ = ("log_post",)
+
+    def __init__(self, prior_sd=PRIOR_SD):
+        self.log_post = [-0.5 * (theta / prior_sd) ** 2 for theta in GRID]
+
+    def update(self, b, is_correct):
+        log_post = self.log_post
+        for g, theta in enumerate(GRID):
+            p = rasch_p(theta, b)
+            log_post[g] += math.log(p if is_correct else 1.0 - p)
+
+    def posterior(self):
+        top = max(self.log_post)
+        weights = [math.exp(lp - top) for lp in self.log_post]
+        total = sum(weights)
+        return [w / total for w in weights]
+
+    def mean(self):
+        return sum(w * theta for w, theta in zip(self.posterior(), GRID))
+
+
+class AdaptivePdaSession(PdaSession):
+    """PDA run that picks each next item adaptively and may stop before 20 cycles.
+
+    Grading, the sampler and the response log behave exactly as in
+    PdaSession; only the item order and the stopping point differ.
+    """
+
+    __slots__ = ("index", "estimate", "rng", "confidence", "min_items", "max_items")
+
+    @classmethod
+    def start(cls, bank, index, rng=random, sampler=None, log=None,
+              confidence=CONFIDENCE, min_items=MIN_ITEMS, max_items=PDA_SESSION_LENGTH):
+        if len(index) != len(bank):
+            raise ValueError("Item index does not match the PDA bank.")
+        if len(bank) < min_items:
+            raise ValueError(f"Not enough PDA questions available (need {min_items}).")
+        session = cls(bank, (), sampler, log)
+        session.index = index
+        session.estimate = AbilityEstimate()
+        session.rng = rng
+        session.confidence = confidence
+        session.min_items = min_items
+        session.max_items = min(max_items, len(bank))
+        session.order = [index.best(session.estimate.mean(), (), rng)]
+        return session
+
+    def check(self, letter):
+        feedback = super().check(letter)
+        self.estimate.update(self.index.difficulties[self.current_index], feedback.is_correct)
+        return feedback
+
+    def advance(self):
+        if self.answered and not self.decided():
+            clusters = self.sampler.cluster_of if self.sampler is not None else None
+            nxt = self.index.best(self.estimate.mean(), set(self.order), self.rng, cluster_of=clusters)
+            if nxt is not None:
+                self.order.append(nxt)
+        return super().advance()
+
+    def band_confidence(self):
+        """(band index, posterior probability that the band is right)."""
+        post = self.estimate.posterior()
+        band = band_index(self.estimated_percent())
+        return band, sum(w for w, b in zip(post, self.index.grid_band) if b == band)
+
+    def decided(self):
+        asked = self.position + 1
+        if asked >= self.max_items:
+            return True
+        return asked >= self.min_items and self.band_confidence()[1] >= self.confidence
+
+    def estimated_percent(self):
+        """Percent the examinee is expected to score on the full bank."""
+        return self.index.percent_at(self.estimate.mean())
+
+    def result(self):
+        total = len(self.order)
+        percent = self.estimated_percent()
+        band, confidence = self.band_confidence()
+        msg = (f"PDA EVALUATION COMPLETE (ADAPTIVE)\n\nSCORE: {self.score}/{total}  "
+               f"(estimated {percent:.1f}%, {confidence:.0%} confidence)\n\n" + pda_band(percent))
+        return Result(self.score, total, percent, msg)
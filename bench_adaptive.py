@@ -0,0 +1,107 @@
+# Attention Dynamics - Adaptive PDA Simulation
+# Simulated examinees take both the fixed 20-cycle PDA evaluation and the
+# adaptive one. Reports the items per session saved, how often the two
+# modes land in the same result band, and how often each matches the band
+# implied by the examinee's true ability.
+#
+# Usage: python bench_adaptive.py --examinees 2000
+#        python bench_adaptive.py --bank-size 500      (synthetic bank)
+
+import argparse
+import os
+import random
+import statistics
+import time
+
+from adaptive import CONFIDENCE, AdaptivePdaSession, ItemInformationIndex, band_index, rasch_p
+from qbank import load_records
+from quiz_engine import PDA_OPTION_MAP_REV, PDA_SESSION_LENGTH, PdaSession, QuestionBank
+from response_log import ResponseLog
+
+LETTERS = tuple(PDA_OPTION_MAP_REV)
+
+
+def synthetic_bank(n, rng):
+    records = [{"question": f"Synthetic item {i}",
+                "options": {letter: f"Option {letter}" for letter in LETTERS},
+                "correct": rng.choice(LETTERS)} for i in range(n)]
+    return QuestionBank(records), ItemInformationIndex([rng.gauss(0.0, 1.0) for _ in range(n)])
+
+
+def logged_bank(path, log_path):
+    bank = QuestionBank(load_records(path))
+    log = ResponseLog(log_path)
+    log.replay()
+    log.close()
+    return bank, ItemInformationIndex.from_log(len(bank), log)
+
+
+def run_session(session, theta, index, rng):
+    """Answer every item as a Rasch examinee of ability ``theta`` would."""
+    while not session.finished:
+        q = session.current()
+        if rng.random() < rasch_p(theta, index.difficulties[session.current_index]):
+            letter = q["correct"]
+        else:
+            letter = rng.choice([l for l in q["options"] if l != q["correct"]])
+        session.check(letter)
+        session.advance()
+    return session.result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate adaptive vs fixed PDA evaluations")
+    parser.add_argument("--examinees", type=int, default=2000)
+    parser.add_argument("--bank-size", type=int, default=0,
+                        help="use a synthetic bank of this size instead of PDA.json")
+    parser.add_argument("--bank", default="PDA.json")
+    parser.add_argument("--log", default="responses.log")
+    parser.add_argument("--confidence", type=float, default=CONFIDENCE)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    if args.bank_size:
+        bank, index = synthetic_bank(args.bank_size, rng)
+    else:
+        bank, index = logged_bank(args.bank, args.log if os.path.exists(args.log) else os.devnull)
+    length = min(PDA_SESSION_LENGTH, len(bank))
+
+    fixed_items, adaptive_items = [], []
+    agree = fixed_right = adaptive_right = 0
+    fixed_time = adaptive_time = 0.0
+    for _ in range(args.examinees):
+        theta = rng.gauss(0.0, 1.0)
+        true_band = band_index(index.expected_percent(theta))
+
+        t0 = time.perf_counter()
+        fixed = run_session(PdaSession.start(bank, length, rng), theta, index, rng)
+        t1 = time.perf_counter()
+        adaptive = run_session(AdaptivePdaSession.start(bank, index, rng, confidence=args.confidence),
+                               theta, index, rng)
+        t2 = time.perf_counter()
+        fixed_time += t1 - t0
+        adaptive_time += t2 - t1
+
+        fixed_band, adaptive_band = band_index(fixed.percent), band_index(adaptive.percent)
+        fixed_items.append(fixed.total)
+        adaptive_items.append(adaptive.total)
+        agree += fixed_band == adaptive_band
+        fixed_right += fixed_band == true_band
+        adaptive_right += adaptive_band == true_band
+
+    n = args.examinees
+    mean_fixed, mean_adaptive = statistics.mean(fixed_items), statistics.mean(adaptive_items)
+    print(f"bank: {len(bank)} items, {n} simulated examinees, confidence {args.confidence:.0%}")
+    print(f"items per session   fixed {mean_fixed:6.2f}   adaptive {mean_adaptive:6.2f}   "
+          f"saved {mean_fixed - mean_adaptive:.2f} ({1 - mean_adaptive / mean_fixed:.0%})")
+    print(f"adaptive items      median {statistics.median(adaptive_items):.0f}   "
+          f"min {min(adaptive_items)}   max {max(adaptive_items)}")
+    print(f"band agreement      adaptive vs fixed {agree / n:.1%}")
+    print(f"band accuracy       fixed {fixed_right / n:.1%}   adaptive {adaptive_right / n:.1%}")
+    print(f"engine time         fixed {fixed_time / n * 1e6:.0f} us/session   "
+          f"adaptive {adaptive_time / n * 1e6:.0f} us/session")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# Attention Dynamics - Quiz Server Load Generator
+# Runs many concurrent simulated terminals against server.py, each playing
+# full sessions over one kept-alive connection, and reports session and
+# request throughput plus request latency percentiles.
+#
+# Usage: python bench_server.py --clients 200 --sessions 5000
+#        python bench_server.py --url http://kiosk-hub:8765 --kind pda
+# Without --url a local server is started on a free port (logging to os.devnull).
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import urllib.parse
+
+from profiling import Histogram
+
+
+class Connection:
+    """Minimal keep-alive HTTP/1.1 JSON client on asyncio streams."""
+
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+
+    async def request(self, method, path, payload=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        self.writer.write(f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                          f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+                          .encode("latin-1") + body)
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        return status, json.loads(await self.reader.readexactly(length))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+async def terminal(host, port, queue, kinds, length, rng, latency, stats):
+    conn = Connection(host, port)
+
+    async def call(method, path, payload=None):
+        t0 = time.perf_counter_ns()
+        status, data = await conn.request(method, path, payload)
+        latency.record((time.perf_counter_ns() - t0) // 1000)
+        stats["requests"] += 1
+        if status >= 400:
+            stats["errors"] += 1
+            raise RuntimeError(data.get("error"))
+        return data
+
+    try:
+        while not queue.empty():
+            queue.get_nowait()
+            kind = rng.choice(kinds)
+            payload = {"kind": "quiz", "count": length} if kind == "quiz" else {"kind": "pda"}
+            try:
+                state = await call("POST", "/sessions", payload)
+                token = state["session"]
+                while not state["finished"]:
+                    options = state["question"]["options"]
+                    choice = rng.randrange(len(options)) if kind == "quiz" else rng.choice(list(options))
+                    await call("POST", f"/sessions/{token}/answer", {"choice": choice})
+                    state = await call("POST", f"/sessions/{token}/next")
+                stats["sessions"] += 1
+            except RuntimeError:
+                continue
+    finally:
+        conn.close()
+
+
+async def run(host, port, clients, sessions, kinds, length, seed):
+    queue = asyncio.Queue()
+    for _ in range(sessions):
+        queue.put_nowait(None)
+    latency = Histogram()  # microseconds
+    stats = {"sessions": 0, "requests": 0, "errors": 0}
+    t0 = time.perf_counter()
+    await asyncio.gather(*(terminal(host, port, queue, kinds, length, random.Random(seed + i), latency, stats)
+                           for i in range(clients)))
+    return time.perf_counter() - t0, latency, stats
+
+
+def start_local_server():
+    proc = subprocess.Popen([sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "server.py"),
+                             "--port", "0", "--log", os.devnull], stdout=subprocess.PIPE, text=True)
+    line = proc.stdout.readline()  # "listening on host:port"
+    if not line.startswith("listening on"):
+        proc.kill()
+        sys.exit("local quiz server failed to start")
+    host, port = line.split()[-1].rsplit(":", 1)
+    return proc, host, int(port)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the quiz server with concurrent terminals")
+    parser.add_argument("--url", help="server to test (default: start one locally)")
+    parser.add_argument("--clients", type=int, default=100, help="concurrent terminals")
+    parser.add_argument("--sessions", type=int, default=2000, help="total sessions to play")
+    parser.add_argument("--kind", choices=("quiz", "pda", "mixed"), default="mixed")
+    parser.add_argument("--length", type=int, default=10, help="questions per quiz session")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    proc = None
+    if args.url:
+        parts = urllib.parse.urlsplit(args.url if "//" in args.url else "http://" + args.url)
+        host, port = parts.hostname, parts.port or 80
+    else:
+        proc, host, port = start_local_server()
+    kinds = ("quiz", "pda") if args.kind == "mixed" else (args.kind,)
+    try:
+        elapsed, latency, stats = asyncio.run(
+            run(host, port, args.clients, args.sessions, kinds, args.length, args.seed))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+    print(f"{args.clients} concurrent terminals, {stats['sessions']} sessions in {elapsed:.2f} s "
+          f"({stats['errors']} errors)")
+    print(f"throughput    {stats['sessions'] / elapsed:9.1f} sessions/s   "
+          f"{stats['requests'] / elapsed:9.1f} requests/s")
+    print(f"latency (ms)  p50 {latency.percentile(50) / 1000:.2f}   p90 {latency.percentile(90) / 1000:.2f}   "
+          f"p99 {latency.percentile(99) / 1000:.2f}   p99.9 {latency.percentile(99.9) / 1000:.2f}   "
+          f"max {latency.max / 1000:.2f}")
+
+
+if __name__ == "__main__":
+    main()
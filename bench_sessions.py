@@ -0,0 +1,308 @@
+# Attention Dynamics - Session Replay Benchmark Suite
+# Replays seeded synthetic sessions (or the sessions recorded in a response
+# log) through the headless engine and, with --tk, through the real
+# AttentionApp callbacks. Reports sessions per second, per-cycle latency
+# percentiles, peak RSS and Tk widget counts, and compares every metric to
+# a JSON baseline; the run exits non-zero when one regresses.
+#
+# Usage: python bench_sessions.py --save-baseline bench_baseline.json
+#        python bench_sessions.py --baseline bench_baseline.json --threshold 0.15
+#        python bench_sessions.py --replay responses.log
+#        xvfb-run -a python bench_sessions.py --tk --baseline bench_baseline_tk.json
+
+import argparse
+import fnmatch
+import json
+import os
+import random
+import sys
+import time
+from collections import OrderedDict
+
+try:
+    import resource
+except ImportError:  # not available on Windows; peak RSS is then not reported
+    resource = None
+
+from bench_transitions import count_widgets, open_app
+from profiling import Histogram
+from qbank import load_records
+from quiz_engine import (PDA_OPTION_MAP_FWD, PDA_OPTION_MAP_REV, PDA_SESSION_LENGTH, PdaSession,
+                         QuestionBank, QuizSession)
+from response_log import KIND_PDA, KIND_QUIZ, ResponseLog, read_records
+from sampler import WeightedSampler
+
+BANK_PATHS = {KIND_QUIZ: "quiz_questions.json", KIND_PDA: "PDA.json"}
+SESSION_CLASSES = {KIND_QUIZ: QuizSession, KIND_PDA: PdaSession}
+KIND_NAMES = {KIND_QUIZ: "quiz", KIND_PDA: "pda"}
+QUIZ_LENGTH = 20
+CORRECT_RATE = 0.7
+THRESHOLD = 0.10                      # allowed relative regression per metric
+HIGHER_IS_BETTER = ("*sessions_per_s",)
+
+
+# ────────────────────────────────────────────────
+#                   SESSION SCRIPTS
+# ────────────────────────────────────────────────
+# A script is (kind, [(question index, choice), ...]); quiz choices are
+# option indexes and PDA choices are letters, as the sessions expect them.
+# Synthetic sessions are drawn by the sampler like live ones, so only whether
+# each scripted answer was right carries over; recorded sessions are replayed
+# question for question with the recorded choices.
+def synthetic_scripts(banks, n, seed, correct_rate=CORRECT_RATE):
+    rng = random.Random(seed)
+    kinds = sorted(banks)
+    for i in range(n):
+        kind = kinds[i % len(kinds)]
+        bank = banks[kind]
+        length = min(PDA_SESSION_LENGTH if kind == KIND_PDA else QUIZ_LENGTH, len(bank))
+        steps = []
+        for idx in rng.sample(range(len(bank)), length):
+            q = bank[idx]
+            if kind == KIND_PDA:
+                letters = list(q["options"])
+                choice = q["correct"] if rng.random() < correct_rate else rng.choice(letters)
+            else:
+                choice = q["correct"] if rng.random() < correct_rate else rng.randrange(len(q["options"]))
+            steps.append((idx, choice))
+        yield kind, steps
+
+
+def recorded_scripts(path, banks):
+    """Sessions from a response log, in recorded order.
+
+    Sessions with stale indexes, or that repeat a question because two runs
+    shared a session id, are not one real session and are dropped.
+    """
+    sessions = OrderedDict()
+    for rec in read_records(path):
+        sessions.setdefault((rec.kind, rec.session_id), []).append(rec)
+    for (kind, _), records in sessions.items():
+        bank = banks.get(kind)
+        if bank is None or any(rec.question >= len(bank) for rec in records):
+            continue
+        if len({rec.question for rec in records}) != len(records):
+            continue
+        if kind == KIND_PDA:
+            yield kind, [(rec.question, PDA_OPTION_MAP_FWD.get(rec.choice)) for rec in records]
+        else:
+            yield kind, [(rec.question, rec.choice) for rec in records]
+
+
+# ────────────────────────────────────────────────
+#                   RUNNERS
+# ────────────────────────────────────────────────
+def _answer(kind, q, correct):
+    """The right choice for ``q``, or a wrong one."""
+    if correct:
+        return q["correct"]
+    if kind == KIND_PDA:
+        return next((letter for letter in q["options"] if letter != q["correct"]), q["correct"])
+    return (q["correct"] + 1) % len(q["options"])
+
+
+def run_engine(banks, scripts, seed, recorded=False):
+    """Replay scripts through the engine exactly as the tabs drive it.
+
+    Sessions are started with ``start`` on seeded samplers and answer into a
+    response log that discards its records, so sampling and logging are timed
+    too. ``recorded`` scripts keep their own questions and choices instead.
+    """
+    samplers = {kind: WeightedSampler(len(bank), seed) for kind, bank in banks.items()}
+    cycles = {kind: Histogram() for kind in banks}   # microseconds
+    sessions = dict.fromkeys(banks, 0)
+    elapsed = dict.fromkeys(banks, 0)
+    log = ResponseLog(os.devnull)
+    try:
+        for kind, steps in scripts:
+            bank, hist, cls = banks[kind], cycles[kind], SESSION_CLASSES[kind]
+            if recorded:
+                choices = [choice for _, choice in steps]
+            else:
+                outcomes = [bank[idx]["correct"] == choice for idx, choice in steps]
+            t_session = time.perf_counter_ns()
+            if recorded:
+                session = cls(bank, [idx for idx, _ in steps], samplers[kind], log)
+            else:
+                session = cls.start(bank, len(steps), sampler=samplers[kind], log=log)
+            for i in range(len(steps)):
+                t0 = time.perf_counter_ns()
+                q = session.current()
+                session.check(choices[i] if recorded else _answer(kind, q, outcomes[i]))
+                session.advance()
+                hist.record((time.perf_counter_ns() - t0) // 1000)
+            session.result()
+            elapsed[kind] += time.perf_counter_ns() - t_session
+            sessions[kind] += 1
+    finally:
+        log.close()
+
+    metrics = {}
+    for kind in banks:
+        name = f"engine.{KIND_NAMES[kind]}"
+        if sessions[kind]:
+            metrics[f"{name}.sessions_per_s"] = sessions[kind] / (elapsed[kind] / 1e9)
+            metrics.update(_latency(name, cycles[kind]))
+    return metrics
+
+
+def run_tk(n, seed, correct_rate=CORRECT_RATE):
+    """Drive the real start/check/next callbacks of both tabs; needs a display."""
+    import tkinter as tk
+
+    root = tk.Tk()
+    app = open_app(root)
+    rng = random.Random(seed)
+    random.seed(seed)
+    app.quiz_sampler.rng.seed(seed)
+    app.pda_sampler.rng.seed(seed)
+    metrics = {}
+    flows = (("quiz", app.start_quiz, app.check_answer, app.next_question, app.selected_option,
+              lambda: app.quiz_session),
+             ("pda", app.start_pda_quiz, app.check_pda_answer, app.next_pda_question,
+              app.selected_pda_option, lambda: app.pda_session))
+    for kind, start, check, advance, var, session in flows:
+        if kind == "quiz":
+            app.num_questions_var.set(min(QUIZ_LENGTH, len(app.quiz_questions)))
+        hist = Histogram()  # microseconds; nanoseconds would saturate at MAX_VALUE (~134 ms)
+        widgets_warm = widgets_peak = None
+        t_start = time.perf_counter_ns()
+        for _ in range(n):
+            start()
+            root.update()
+            while not session().finished:
+                t0 = time.perf_counter_ns()
+                q = session().current()
+                correct = PDA_OPTION_MAP_REV[q["correct"]] if kind == "pda" else q["correct"]
+                var.set(correct if rng.random() < correct_rate else rng.randrange(len(q["options"])))
+                check()
+                root.update_idletasks()
+                advance()
+                root.update_idletasks()
+                hist.record((time.perf_counter_ns() - t0) // 1000)
+            root.update()
+            widgets = count_widgets(root)
+            if widgets_warm is None:
+                widgets_warm = widgets  # the option pool is filled by the first session
+            widgets_peak = max(widgets_peak or 0, widgets)
+        elapsed = time.perf_counter_ns() - t_start
+        name = f"tk.{kind}"
+        metrics[f"{name}.sessions_per_s"] = n / (elapsed / 1e9)
+        metrics.update(_latency(name, hist))
+        metrics[f"{name}.widgets_live"] = widgets_peak
+        metrics[f"{name}.widgets_growth"] = widgets_peak - widgets_warm
+    app.response_log.close()
+    root.destroy()
+    return metrics
+
+
+def _latency(name, hist):
+    return {f"{name}.cycle_{label}_us": hist.percentile(pct)
+            for label, pct in (("p50", 50), ("p90", 90), ("p99", 99))}
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024  # bytes vs KiB
+
+
+# ────────────────────────────────────────────────
+#                   BASELINES
+# ────────────────────────────────────────────────
+def parse_thresholds(specs, default):
+    thresholds = []
+    for spec in specs:
+        pattern, _, value = spec.partition("=")
+        thresholds.append((pattern, float(value)))
+    return lambda metric: next((t for p, t in reversed(thresholds) if fnmatch.fnmatch(metric, p)), default)
+
+
+def compare(metrics, baseline, threshold_for):
+    """Rows of (metric, value, baseline, change, regressed).
+
+    A baseline metric this run did not produce is a regression with no value.
+    """
+    rows = [(metric, None, base, None, True) for metric, base in sorted(baseline.items())
+            if metric not in metrics]
+    for metric, value in sorted(metrics.items()):
+        base = baseline.get(metric)
+        if base is None:
+            rows.append((metric, value, None, None, False))
+            continue
+        higher = any(fnmatch.fnmatch(metric, p) for p in HIGHER_IS_BETTER)
+        limit = threshold_for(metric)
+        if higher:
+            regressed = value < base * (1 - limit)
+        else:
+            regressed = value > base * (1 + limit)
+        change = (value - base) / base if base else 0.0 if value == base else float("inf")
+        rows.append((metric, value, base, change, regressed))
+    rows.sort(key=lambda row: row[0])
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay sessions and check for performance regressions")
+    parser.add_argument("--sessions", type=int, default=5000, help="engine sessions to replay")
+    parser.add_argument("--replay", metavar="LOG", help="replay the sessions recorded in a response log")
+    parser.add_argument("--tk", action="store_true", help="also drive the real Tk callbacks (needs a display)")
+    parser.add_argument("--tk-sessions", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", help="JSON baseline to compare against")
+    parser.add_argument("--save-baseline", metavar="PATH", help="write this run's metrics as a baseline")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="allowed relative regression (0.10 = 10%%)")
+    parser.add_argument("--threshold-for", action="append", default=[], metavar="PATTERN=FRACTION",
+                        help="per-metric override, e.g. 'tk.*.cycle_p99_us=0.3' (repeatable)")
+    parser.add_argument("--json", metavar="PATH", help="write this run's metrics and comparison")
+    args = parser.parse_args(argv)
+
+    banks = {kind: QuestionBank(load_records(path)) for kind, path in BANK_PATHS.items()}
+    if args.replay:
+        scripts = list(recorded_scripts(args.replay, banks))
+    else:
+        scripts = list(synthetic_scripts(banks, args.sessions, args.seed))
+
+    metrics = run_engine(banks, scripts, args.seed, recorded=bool(args.replay))
+    if args.tk:
+        metrics.update(run_tk(args.tk_sessions, args.seed))
+    rss = peak_rss_mb()
+    if rss is not None:
+        metrics["peak_rss_mb"] = rss
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["metrics"]
+    rows = compare(metrics, baseline, parse_thresholds(args.threshold_for, args.threshold))
+
+    print(f"{len(scripts)} engine sessions replayed ({'recorded' if args.replay else 'synthetic'}, seed {args.seed})")
+    for metric, value, base, change, regressed in rows:
+        if value is None:
+            print(f"{metric:<32} {'missing':>14}   baseline {base:14.2f}   {'':>8}   REGRESSED")
+            continue
+        line = f"{metric:<32} {value:14.2f}"
+        if base is not None:
+            line += f"   baseline {base:14.2f}   {change:+8.1%}   {'REGRESSED' if regressed else 'ok'}"
+        print(line)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump({"seed": args.seed, "sessions": len(scripts), "metrics": metrics}, f, indent=2)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"metrics": metrics, "comparison": [
+                {"metric": m, "value": v, "baseline": b, "change": c, "regressed": r}
+                for m, v, b, c, r in rows]}, f, indent=2)
+
+    regressions = [row[0] for row in rows if row[4]]
+    if regressions:
+        print(f"\n{len(regressions)} metrics regressed past their threshold: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
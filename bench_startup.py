@@ -0,0 +1,73 @@
+# Attention Dynamics - Cold Start Benchmark
+# Launches the app in fresh interpreters and reports time-to-first-paint,
+# time until all data banks are loaded, and per-tab time-to-interactive
+# (first selection of a tab, including its lazy construction).
+#
+# Needs a display; on headless hosts run under Xvfb:
+#   xvfb-run -a python bench_startup.py --runs 10
+
+import time
+
+_STARTED = time.perf_counter()  # before any other import, so imports are counted
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+TAB_ORDER = ("tips", "quiz", "pda")
+
+
+def child():
+    import tkinter as tk
+    from quiz import AttentionApp
+
+    root = tk.Tk()
+    app = AttentionApp(root, _STARTED)
+    root.update()
+    result = {"first_paint_ms": (time.perf_counter() - _STARTED) * 1000}
+
+    while app._banks_pending:
+        root.update()
+        time.sleep(0.001)
+    result["data_ready_ms"] = (time.perf_counter() - _STARTED) * 1000
+
+    frames = {key: frame for frame, key in app.tab_keys.items()}
+    for key in TAB_ORDER:
+        t0 = time.perf_counter()
+        app.notebook.select(frames[key])
+        root.update()
+        result[f"{key}_interactive_ms"] = (time.perf_counter() - t0) * 1000
+    root.destroy()
+    print(json.dumps(result))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold start and per-tab time-to-interactive")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="print the raw per-run results")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child()
+        return
+
+    runs = []
+    for _ in range(args.runs):
+        t0 = time.perf_counter()
+        out = subprocess.run([sys.executable, __file__, "--child"], capture_output=True, text=True, check=True)
+        run = json.loads(out.stdout.strip().splitlines()[-1])
+        run["process_wall_ms"] = (time.perf_counter() - t0) * 1000
+        runs.append(run)
+
+    if args.json:
+        print(json.dumps(runs, indent=2))
+    for metric in runs[0]:
+        values = [run[metric] for run in runs]
+        print(f"{metric:<24} median {statistics.median(values):8.1f} ms   "
+              f"min {min(values):8.1f} ms   max {max(values):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
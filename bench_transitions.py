@@ -0,0 +1,103 @@
+# Attention Dynamics - Cycle Transition Benchmark
+# Drives the EVALUATION and PDA tabs through answer -> feedback -> next
+# question cycles and reports per-cycle transition latency.
+#
+# Needs a display; on headless hosts run under Xvfb:
+#   xvfb-run -a python bench_transitions.py --cycles 500
+# For "before" numbers, point it at an older checkout (any version since the
+# headless engine was extracted):
+#   git worktree add ../before <commit>
+#   xvfb-run -a python bench_transitions.py --app-dir ../before --cycles 500
+
+import argparse
+import inspect
+import os
+import random
+import statistics
+import sys
+import time
+
+
+def count_widgets(widget):
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+def open_app(root, log_path=os.devnull):
+    """An AttentionApp with every bank loaded and every tab built.
+
+    Older versions load synchronously, build every tab up front and keep no
+    response log; those steps are skipped when the app does not have them.
+    """
+    from quiz import AttentionApp
+    if "log_path" in inspect.signature(AttentionApp).parameters:
+        app = AttentionApp(root, log_path=log_path)
+    else:
+        app = AttentionApp(root)
+    while getattr(app, "_banks_pending", 0):
+        root.update()
+        time.sleep(0.001)
+    for frame in getattr(app, "tab_keys", ()):
+        app.notebook.select(frame)
+        root.update()
+    return app
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def _cycles(root, app, cycles, start, check, advance, var, finished):
+    samples = []
+    start()
+    root.update()
+    for _ in range(cycles):
+        t0 = time.perf_counter()
+        var.set(0)
+        check()
+        root.update_idletasks()
+        advance()
+        root.update_idletasks()
+        samples.append((time.perf_counter() - t0) * 1000)
+        if finished():
+            start()
+            root.update()
+    return samples
+
+
+def report(name, samples, widgets_before, widgets_after):
+    print(f"{name:<10} cycles={len(samples):<6} mean={statistics.mean(samples):7.3f}ms "
+          f"p50={percentile(samples, 50):7.3f}ms p95={percentile(samples, 95):7.3f}ms "
+          f"p99={percentile(samples, 99):7.3f}ms widgets {widgets_before} -> {widgets_after}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure per-cycle transition latency")
+    parser.add_argument("--cycles", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--app-dir", help="checkout whose quiz.py and banks to measure (default: this one)")
+    args = parser.parse_args()
+
+    if args.app_dir:
+        sys.path.insert(0, os.path.abspath(args.app_dir))
+        os.chdir(args.app_dir)  # the banks are loaded relative to the working directory
+    import tkinter as tk
+
+    random.seed(args.seed)
+    root = tk.Tk()
+    app = open_app(root)
+
+    before = count_widgets(root)
+    samples = _cycles(root, app, args.cycles, app.start_quiz, app.check_answer, app.next_question,
+                      app.selected_option, lambda: app.quiz_session.finished)
+    report("EVALUATION", samples, before, count_widgets(root))
+
+    before = count_widgets(root)
+    samples = _cycles(root, app, args.cycles, app.start_pda_quiz, app.check_pda_answer, app.next_pda_question,
+                      app.selected_pda_option, lambda: app.pda_session.finished)
+    report("PDA", samples, before, count_widgets(root))
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
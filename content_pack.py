@@ -0,0 +1,283 @@
+# Attention Dynamics - Sharded Content Packs
+# A content pack is a directory of small shard files (one topic or chunk of
+# questions each) plus a manifest listing every shard with its bank, item
+# count and content hash. Banks are exposed as lazy sequences: their length
+# comes from the manifest, and a shard is only parsed when one of its
+# questions is actually asked.
+#
+# Layout:
+#   packs/manifest.json          {"version": 1, "banks": {"quiz": [{"path": ...,
+#                                 "count": ..., "sha256": ...}, ...], ...}}
+#   packs/quiz/<shard>.json      same record format as quiz_questions.json
+#   packs/pda/<shard>.json       same record format as PDA.json
+#   packs/tips/<shard>.json      same record format as tips.json
+#
+# Usage: python content_pack.py split [--pack packs] [--shard-size 50]
+#        python content_pack.py build [--pack packs]
+
+import argparse
+import bisect
+import hashlib
+import json
+import os
+import sys
+import threading
+import weakref
+from collections import OrderedDict, namedtuple
+
+from qbank import load_records
+from quiz_engine import BankLoadError, read_json
+
+PACK_DIR = "packs"
+MANIFEST = "manifest.json"
+VERSION = 1
+BANK_PATHS = {"tips": "tips.json", "quiz": "quiz_questions.json", "pda": "PDA.json"}
+SHARD_SIZE = 50
+SHARD_CACHE_SIZE = 16   # parsed shards kept in memory, across all banks
+
+Shard = namedtuple("Shard", "path count sha256")
+
+
+def manifest_path(root=PACK_DIR):
+    return os.path.join(root, MANIFEST)
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ShardCache:
+    """Parsed shards keyed by (path, hash); the least recently used is evicted first.
+
+    Shared by every bank of a pack and safe to use from the loader thread.
+    """
+
+    def __init__(self, capacity=SHARD_CACHE_SIZE):
+        self.capacity = capacity
+        self.loads = 0
+        self.hits = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def peek(self, shard, path):
+        """The cached records for ``shard``, or None; does not touch the LRU order."""
+        with self._lock:
+            return self._entries.get((path, shard.sha256))
+
+    def get(self, shard, path):
+        key = (path, shard.sha256)
+        with self._lock:
+            records = self._entries.get(key)
+            if records is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return records
+        # Never cache an edited file under the hash of the version the caller expects
+        if file_hash(path) != shard.sha256:
+            raise BankLoadError(f"Shard {path} changed since the manifest was read")
+        records = load_records(path)  # parse outside the lock
+        if len(records) != shard.count:
+            raise BankLoadError(f"Shard {path} has {len(records)} items but the manifest "
+                                f"lists {shard.count}; rebuild it with content_pack.py build")
+        with self._lock:
+            self._entries[key] = records
+            self._entries.move_to_end(key)
+            self.loads += 1
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+        return records
+
+    def evict(self, path):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == path]:
+                del self._entries[key]
+
+
+class ShardedBank:
+    """Read-only sequence over one bank's shards, in manifest order."""
+
+    def __init__(self, root, shards, cache):
+        self.root = root
+        self.shards = tuple(shards)
+        self.cache = cache
+        self._held = {}     # shard position -> records kept alive after a reload
+        self._starts = []
+        total = 0
+        for shard in self.shards:
+            self._starts.append(total)
+            total += shard.count
+        self._count = total
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, idx):
+        if idx < 0:
+            idx += self._count
+        if not 0 <= idx < self._count:
+            raise IndexError("bank index out of range")
+        i = bisect.bisect_right(self._starts, idx) - 1
+        records = self._held.get(i)
+        if records is None:
+            shard = self.shards[i]
+            records = self.cache.get(shard, os.path.join(self.root, shard.path))
+        return records[idx - self._starts[i]]
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self[i]
+
+    def retire(self, changed):
+        """Hold on to the parsed shards in ``changed`` before the cache drops them.
+
+        Called when a reload supersedes this bank, so sessions still using it
+        keep seeing the questions they started with. A shard that was never
+        parsed cannot be recovered and raises BankLoadError when reached.
+        """
+        for i, shard in enumerate(self.shards):
+            if shard in changed and i not in self._held:
+                records = self.cache.peek(shard, os.path.join(self.root, shard.path))
+                if records is not None:
+                    self._held[i] = records
+
+
+class ContentPack:
+    """Manifest-driven view of a pack directory.
+
+    ``refresh()`` re-reads the manifest when it changes on disk and drops
+    cached shards whose hash no longer matches, so edited content is picked
+    up without restarting.
+    """
+
+    def __init__(self, root=PACK_DIR, cache=None):
+        self.root = root
+        self.cache = ShardCache() if cache is None else cache
+        self.shards = {}     # bank -> tuple of Shard
+        self._stamp = None
+        self._banks = weakref.WeakSet()  # ShardedBanks handed out, retired on reload
+        self._banks_lock = threading.Lock()
+        self.refresh()
+
+    @staticmethod
+    def exists(root=PACK_DIR):
+        return os.path.exists(manifest_path(root))
+
+    def refresh(self):
+        """Reload the manifest if it changed; returns the banks whose shards changed."""
+        path = manifest_path(self.root)
+        try:
+            st = os.stat(path)
+        except OSError:
+            raise BankLoadError(f"Content pack manifest not found: {path}") from None
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp == self._stamp:
+            return set()
+
+        manifest = read_json(path)
+        if manifest.get("version") != VERSION:
+            raise BankLoadError(f"Unsupported content pack version in {path}")
+        shards = {}
+        for bank, entries in manifest.get("banks", {}).items():
+            shards[bank] = tuple(Shard(e["path"], e["count"], e["sha256"]) for e in entries)
+            for shard in shards[bank]:
+                if not os.path.exists(os.path.join(self.root, shard.path)):
+                    raise BankLoadError(f"Data file not found: {os.path.join(self.root, shard.path)}")
+
+        changed = {bank for bank in shards.keys() | self.shards.keys()
+                   if shards.get(bank) != self.shards.get(bank)}
+        stale = set()
+        for bank in changed:
+            current = set(shards.get(bank, ()))
+            stale.update(shard for shard in self.shards.get(bank, ()) if shard not in current)
+        if stale:
+            with self._banks_lock:
+                live = list(self._banks)
+            for sharded in live:
+                sharded.retire(stale)
+            for shard in stale:
+                self.cache.evict(os.path.join(self.root, shard.path))
+        self.shards = shards
+        self._stamp = stamp
+        return changed
+
+    def count(self, bank):
+        """Item count straight from the manifest; no shard is read."""
+        return sum(shard.count for shard in self.shards.get(bank, ()))
+
+    def bank(self, bank):
+        sharded = ShardedBank(self.root, self.shards.get(bank, ()), self.cache)
+        with self._banks_lock:
+            self._banks.add(sharded)
+        return sharded
+
+
+# ────────────────────────────────────────────────
+#                   PACK AUTHORING
+# ────────────────────────────────────────────────
+def _write_json(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def build_manifest(root=PACK_DIR):
+    """Scan ``root/<bank>/*.json`` and (re)write the manifest with counts and hashes."""
+    banks = {}
+    for bank in BANK_PATHS:
+        bank_dir = os.path.join(root, bank)
+        if not os.path.isdir(bank_dir):
+            continue
+        entries = []
+        for name in sorted(os.listdir(bank_dir)):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(bank_dir, name)
+            entries.append({"path": f"{bank}/{name}", "count": len(read_json(path)),
+                            "sha256": file_hash(path)})
+        banks[bank] = entries
+    _write_json(manifest_path(root), {"version": VERSION, "banks": banks})
+    return banks
+
+
+def split_banks(root=PACK_DIR, shard_size=SHARD_SIZE, bank_paths=BANK_PATHS):
+    """Cut the monolithic bank files into ``shard_size`` shards and build the manifest."""
+    for bank, source in bank_paths.items():
+        records = list(load_records(source))
+        bank_dir = os.path.join(root, bank)
+        os.makedirs(bank_dir, exist_ok=True)
+        for n, start in enumerate(range(0, len(records), shard_size)):
+            _write_json(os.path.join(bank_dir, f"{bank}-{n:03d}.json"),
+                        records[start:start + shard_size])
+    return build_manifest(root)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Author sharded content packs")
+    parser.add_argument("command", choices=("split", "build"),
+                        help="split the monolithic banks into shards, or rebuild the manifest")
+    parser.add_argument("--pack", default=PACK_DIR)
+    parser.add_argument("--shard-size", type=int, default=SHARD_SIZE)
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "split":
+            banks = split_banks(args.pack, args.shard_size)
+        else:
+            banks = build_manifest(args.pack)
+    except BankLoadError as e:
+        sys.exit(str(e))
+    for bank, entries in banks.items():
+        print(f"{bank}: {sum(e['count'] for e in entries)} items in {len(entries)} shards")
+    print(f"wrote {manifest_path(args.pack)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+# Attention Dynamics - Near-Duplicate Question Lint
+# MinHash signatures over word shingles of each question plus its options,
+# bucketed with LSH banding so near-duplicates are found without comparing
+# every pair. The signature index is persisted and synced incrementally:
+# only new or edited items are re-shingled.
+#
+# Usage: python dedupe.py [--index banks.lsh] [--threshold 0.6]
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # pure-Python signatures, same values, just slower
+    np = None
+
+from qbank import load_records
+from quiz_engine import BankLoadError
+
+DEDUPE_INDEX = "banks.lsh"
+BANK_PATHS = {"quiz": "quiz_questions.json", "pda": "PDA.json"}
+VERSION = 1
+
+NUM_PERM = 64
+BANDS = 16          # 16 bands x 4 rows: candidate pairs from ~0.5 Jaccard up
+THRESHOLD = 0.6     # estimated Jaccard needed to report a pair
+SHINGLE_WORDS = 3
+MASK64 = (1 << 64) - 1
+
+_WORD = re.compile(r"[a-z0-9']+")
+
+
+def item_text(record):
+    options = record["options"]
+    options = options.values() if isinstance(options, dict) else options
+    return " ".join([record["question"], *options])
+
+
+def _hash64(data):
+    return int.from_bytes(hashlib.blake2b(data.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def shingles(text):
+    words = _WORD.findall(text.lower())
+    if len(words) < SHINGLE_WORDS:
+        return {" ".join(words)}
+    return {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+
+class MinHashIndex:
+    def __init__(self, num_perm=NUM_PERM, bands=BANDS, threshold=THRESHOLD, seed=1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        rng = random.Random(seed)
+        # Multiply-shift hashing: h(x) = ((a*x + b) mod 2^64) >> 32, a odd
+        self._a = [rng.getrandbits(64) | 1 for _ in range(num_perm)]
+        self._b = [rng.getrandbits(64) for _ in range(num_perm)]
+        if np is not None:
+            self._a_np = np.array(self._a, dtype=np.uint64)
+            self._b_np = np.array(self._b, dtype=np.uint64)
+
+        self.keys = []           # id -> key, None once removed
+        self.fingerprints = []   # id -> content hash of the item text
+        self.signatures = []     # id -> array('I')
+        self.ids = {}            # key -> id
+        self.buckets = [{} for _ in range(bands)]  # band hash -> id or [ids]
+
+    def __len__(self):
+        return len(self.ids)
+
+    # ── Signatures ──
+    def signature(self, text):
+        hashes = [_hash64(s) for s in shingles(text)]
+        if np is not None:
+            xs = np.array(hashes, dtype=np.uint64)[:, None]
+            return array("I", ((xs * self._a_np + self._b_np) >> np.uint64(32)).min(axis=0).tolist())
+        return array("I", [min(((a * x + b) & MASK64) >> 32 for x in hashes)
+                           for a, b in zip(self._a, self._b)])
+
+    def similarity(self, sig_a, sig_b):
+        """Estimated Jaccard similarity of two signatures."""
+        return sum(x == y for x, y in zip(sig_a, sig_b)) / self.num_perm
+
+    def _band_keys(self, sig):
+        r = self.rows
+        return [hash(tuple(sig[i * r:(i + 1) * r])) for i in range(self.bands)]
+
+    # ── Buckets ──
+    def _bucket_add(self, item_id):
+        for band, h in zip(self.buckets, self._band_keys(self.signatures[item_id])):
+            cur = band.get(h)
+            if cur is None:
+                band[h] = item_id
+            elif isinstance(cur, list):
+                cur.append(item_id)
+            else:
+                band[h] = [cur, item_id]
+
+    def _bucket_remove(self, item_id):
+        for band, h in zip(self.buckets, self._band_keys(self.signatures[item_id])):
+            cur = band.get(h)
+            if cur == item_id:
+                del band[h]
+            elif isinstance(cur, list):
+                cur.remove(item_id)
+                if len(cur) == 1:
+                    band[h] = cur[0]
+
+    def _candidates(self, sig):
+        found = set()
+        for band, h in zip(self.buckets, self._band_keys(sig)):
+            cur = band.get(h)
+            if cur is None:
+                continue
+            if isinstance(cur, list):
+                found.update(cur)
+            else:
+                found.add(cur)
+        return found
+
+    # ── Queries and updates ──
+    def query(self, text, sig=None):
+        """Near-duplicates of ``text`` already in the index, as (key, similarity), best first."""
+        sig = self.signature(text) if sig is None else sig
+        hits = []
+        for item_id in self._candidates(sig):
+            sim = self.similarity(sig, self.signatures[item_id])
+            if sim >= self.threshold:
+                hits.append((self.keys[item_id], sim))
+        return sorted(hits, key=lambda hit: -hit[1])
+
+    def add(self, key, text):
+        """Check ``text`` against the index, then insert it; returns its near-duplicates."""
+        fingerprint = _hash64(text)
+        item_id = self.ids.get(key)
+        if item_id is not None:
+            if self.fingerprints[item_id] == fingerprint:
+                return [hit for hit in self.query(text, self.signatures[item_id]) if hit[0] != key]
+            self.remove(key)
+        sig = self.signature(text)
+        hits = self.query(text, sig)
+        item_id = len(self.keys)
+        self.keys.append(key)
+        self.fingerprints.append(fingerprint)
+        self.signatures.append(sig)
+        self.ids[key] = item_id
+        self._bucket_add(item_id)
+        return hits
+
+    def remove(self, key):
+        item_id = self.ids.pop(key)
+        self._bucket_remove(item_id)
+        self.keys[item_id] = None
+
+    def sync(self, prefix, records):
+        """Bring the ``prefix:N`` keys in line with ``records``; returns the keys (re)indexed."""
+        changed, live = [], set()
+        for i, record in enumerate(records):
+            key = f"{prefix}:{i}"
+            live.add(key)
+            text = item_text(record)
+            item_id = self.ids.get(key)
+            if item_id is None or self.fingerprints[item_id] != _hash64(text):
+                self.add(key, text)
+                changed.append(key)
+        stale = [k for k in self.ids if k.startswith(prefix + ":") and k not in live]
+        for key in stale:
+            self.remove(key)
+        return changed
+
+    def clusters(self, prefix=None):
+        """Groups (size >= 2) of mutually linked near-duplicate keys."""
+        parent = {}
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]  # path halving
+                x = parent[x]
+            return x
+
+        for key, item_id in self.ids.items():
+            if prefix is not None and not key.startswith(prefix + ":"):
+                continue
+            sig = self.signatures[item_id]
+            for other_id in self._candidates(sig):
+                other = self.keys[other_id]
+                if other_id == item_id or (prefix is not None and not other.startswith(prefix + ":")):
+                    continue
+                if self.similarity(sig, self.signatures[other_id]) >= self.threshold:
+                    parent.setdefault(key, key)
+                    parent.setdefault(other, other)
+                    ra, rb = find(key), find(other)
+                    if ra != rb:
+                        parent[ra] = rb
+
+        groups = {}
+        for key in parent:
+            groups.setdefault(find(key), []).append(key)
+        return [sorted(g) for g in groups.values() if len(g) > 1]
+
+    # ── Persistence ──
+    def save(self, path):
+        live = [i for i, key in enumerate(self.keys) if key is not None]
+        header = {"version": VERSION, "num_perm": self.num_perm, "bands": self.bands,
+                  "threshold": self.threshold,
+                  "keys": [self.keys[i] for i in live],
+                  "fingerprints": [self.fingerprints[i] for i in live]}
+        sigs = array("I")
+        for i in live:
+            sigs.extend(self.signatures[i])
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(json.dumps(header).encode("utf-8") + b"\n")
+            sigs.tofile(f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            header = json.loads(f.readline())
+            if header.get("version") != VERSION:
+                raise ValueError(f"Unsupported dedupe index version in {path}")
+            index = cls(header["num_perm"], header["bands"], header["threshold"])
+            sigs = array("I")
+            sigs.frombytes(f.read())
+        n = index.num_perm
+        for i, (key, fingerprint) in enumerate(zip(header["keys"], header["fingerprints"])):
+            index.keys.append(key)
+            index.fingerprints.append(fingerprint)
+            index.signatures.append(sigs[i * n:(i + 1) * n])
+            index.ids[key] = i
+            index._bucket_add(i)
+        return index
+
+
+def bank_clusters(prefix, records, path=DEDUPE_INDEX):
+    """Near-duplicate groups within one bank, as lists of bank indexes.
+
+    Uses the persisted index when there is one (syncing only edited items);
+    returns no groups if the lint has never been run.
+    """
+    if not os.path.exists(path):
+        return []
+    try:
+        index = MinHashIndex.load(path)
+    except (OSError, ValueError):
+        return []
+    index.sync(prefix, records)
+    return [[int(key.split(":", 1)[1]) for key in group] for group in index.clusters(prefix)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Flag near-duplicate questions across banks")
+    parser.add_argument("--index", default=DEDUPE_INDEX)
+    parser.add_argument("--threshold", type=float, default=None)
+    parser.add_argument("--rebuild", action="store_true", help="ignore the saved index")
+    args = parser.parse_args(argv)
+
+    if os.path.exists(args.index) and not args.rebuild:
+        index = MinHashIndex.load(args.index)
+    else:
+        index = MinHashIndex()
+    if args.threshold is not None:
+        index.threshold = args.threshold
+
+    banks = {}
+    for prefix, path in BANK_PATHS.items():
+        try:
+            banks[prefix] = load_records(path)
+        except BankLoadError as e:
+            sys.exit(str(e))
+        changed = index.sync(prefix, banks[prefix])
+        print(f"{path}: {len(banks[prefix])} items, {len(changed)} (re)indexed")
+    index.save(args.index)
+
+    groups = index.clusters()
+    for group in groups:
+        print(f"\nnear-duplicate group ({len(group)}):")
+        for key in group:
+            prefix, i = key.split(":", 1)
+            print(f"  {key:<10} {banks[prefix][int(i)]['question'][:90]}")
+    print(f"\n{len(groups)} groups found")
+    return 1 if groups else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,235 @@
+# Attention Dynamics - Bulk Answer Sheet Grading
+# Scores offline answer sheets with the same rules and result bands as the
+# EVALUATION and PDA tabs. Sheets are streamed, graded in chunks across a
+# process pool and written out as they complete, so memory stays flat no
+# matter how large the input is.
+#
+# Input (JSONL), one sheet per line:
+#   {"id": "s-001", "kind": "pda", "answers": [[12, "C"], [4, "A"], ...]}
+# Input (CSV), one answer per row, rows of a sheet kept together:
+#   id,kind,question,answer
+# "question" is the index into the bank (the content pack's when packs/
+# exists, as the app and server serve it); quiz answers are option indexes,
+# PDA answers are letters (or 0-3, mapped through PDA_OPTION_MAP_FWD).
+#
+# Usage: python grade.py sheets.jsonl -o results.jsonl --workers 4
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from content_pack import ContentPack
+from qbank import load_records
+from quiz_engine import (BankLoadError, PDA_OPTION_MAP_FWD, QuestionBank, grade_pda,
+                         grade_quiz, pda_band, pda_result, quiz_band, quiz_result)
+
+BANK_PATHS = {"quiz": "quiz_questions.json", "pda": "PDA.json"}
+CHUNK_SIZE = 500
+CSV_FIELDS = ("id", "kind", "question", "answer")
+RESULT_FIELDS = ("id", "kind", "score", "total", "percent", "band", "errors")
+
+# Set per worker process by _init_worker; compiled banks are memory-mapped,
+# so every worker shares the same pages instead of a pickled copy per task,
+# and content pack shards are only parsed once a sheet reaches them.
+_BANKS = {}
+
+
+def load_banks(bank_paths=BANK_PATHS):
+    """Banks by kind, from the content pack when there is one."""
+    pack = ContentPack() if ContentPack.exists() else None
+    return {kind: QuestionBank(pack.bank(kind) if pack is not None else load_records(path))
+            for kind, path in bank_paths.items()}
+
+
+def _init_worker(bank_paths):
+    _BANKS.update(load_banks(bank_paths))
+
+
+# ────────────────────────────────────────────────
+#                   GRADING
+# ────────────────────────────────────────────────
+def _pda_letter(answer):
+    if isinstance(answer, int) or (isinstance(answer, str) and answer.isdigit()):
+        return PDA_OPTION_MAP_FWD.get(int(answer))
+    return answer.strip().upper() if isinstance(answer, str) else None
+
+
+def _quiz_choice(answer):
+    try:
+        return int(answer)
+    except (TypeError, ValueError):
+        return None
+
+
+def _rejected(sheet_id, kind, error):
+    return {"id": sheet_id, "kind": kind, "score": 0, "total": 0, "percent": 0.0,
+            "band": "", "errors": [error]}
+
+
+def grade_sheet(sheet, banks=None):
+    banks = _BANKS if banks is None else banks
+    if not isinstance(sheet, dict):
+        return _rejected(None, None, f"sheet must be a JSON object, got {type(sheet).__name__}")
+    if "error" in sheet:  # a line the reader could not parse
+        return _rejected(sheet.get("id"), None, sheet["error"])
+    kind = sheet.get("kind")
+    if not isinstance(kind, str) or kind not in BANK_PATHS:
+        return _rejected(sheet.get("id"), kind, f"unknown sheet kind: {kind!r}")
+    answers = sheet.get("answers", ())
+    if not isinstance(answers, (list, tuple)):
+        return _rejected(sheet.get("id"), kind, "answers must be a list of [question, answer] pairs")
+    bank = banks[kind]
+    score, total, errors = 0, 0, []
+    for entry in answers:
+        try:
+            question, answer = entry
+        except (TypeError, ValueError):
+            errors.append(f"malformed answer {entry!r}")
+            continue
+        try:
+            idx = int(question)
+            if idx < 0:
+                raise IndexError(idx)
+            q = bank[idx]
+        except (IndexError, TypeError, ValueError):
+            errors.append(f"unknown question {question!r}")
+            continue
+        total += 1
+        if kind == "quiz":
+            choice = _quiz_choice(answer)
+            is_correct = choice is not None and grade_quiz(q, choice).is_correct
+        else:
+            letter = _pda_letter(answer)
+            is_correct = letter is not None and grade_pda(q, letter).is_correct
+        score += is_correct
+    result = quiz_result(score, total) if kind == "quiz" else pda_result(score, total)
+    band = quiz_band(result.percent) if kind == "quiz" else pda_band(result.percent)
+    return {"id": sheet.get("id"), "kind": kind, "score": score, "total": total,
+            "percent": round(result.percent, 1), "band": band, "errors": errors}
+
+
+def _grade_or_reject(sheet):
+    try:
+        return grade_sheet(sheet)
+    except Exception as e:  # one odd sheet must not cost the rest of the chunk
+        sheet_id = sheet.get("id") if isinstance(sheet, dict) else None
+        return _rejected(sheet_id, None, f"could not grade sheet: {e!r}")
+
+
+def grade_chunk(sheets):
+    return [_grade_or_reject(sheet) for sheet in sheets]
+
+
+# ────────────────────────────────────────────────
+#                   STREAMING I/O
+# ────────────────────────────────────────────────
+def read_jsonl(f):
+    for n, line in enumerate(f, 1):
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                yield {"id": f"line {n}", "error": f"invalid JSON on line {n}: {e.msg}"}
+
+
+def read_csv(f):
+    """Sheets from CSV rows; raises ValueError up front if a column is missing."""
+    rows = csv.DictReader(f)
+    missing = [name for name in CSV_FIELDS if name not in (rows.fieldnames or ())]
+    if missing:
+        raise ValueError(f"CSV sheets need the columns {','.join(CSV_FIELDS)}; "
+                         f"missing {', '.join(missing)}")
+    return _csv_sheets(rows)
+
+
+def _csv_sheets(rows):
+    for (sheet_id, kind), group in itertools.groupby(rows, key=lambda row: (row["id"], row["kind"])):
+        yield {"id": sheet_id, "kind": kind,
+               "answers": [(row["question"], row["answer"]) for row in group]}
+
+
+def read_sheets(path, f):
+    return read_csv(f) if path.endswith(".csv") else read_jsonl(f)
+
+
+class ResultWriter:
+    def __init__(self, path, f):
+        self.f = f
+        self.csv = None
+        if path.endswith(".csv"):
+            self.csv = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+            self.csv.writeheader()
+
+    def write(self, result):
+        if self.csv is not None:
+            self.csv.writerow(dict(result, errors="; ".join(result["errors"])))
+        else:
+            self.f.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+
+def _chunks(iterable, size):
+    it = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def grade_stream(sheets, write, workers=None, chunk_size=CHUNK_SIZE, bank_paths=BANK_PATHS):
+    """Grade ``sheets`` in input order, keeping at most two chunks per worker in flight."""
+    workers = workers or os.cpu_count() or 1
+    graded = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(bank_paths,)) as pool:
+        in_flight = deque()
+        for chunk in _chunks(sheets, chunk_size):
+            in_flight.append(pool.submit(grade_chunk, chunk))
+            if len(in_flight) >= 2 * workers:
+                for result in in_flight.popleft().result():
+                    write(result)
+                    graded += 1
+        while in_flight:
+            for result in in_flight.popleft().result():
+                write(result)
+                graded += 1
+    return graded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Grade answer sheets in bulk")
+    parser.add_argument("sheets", help="JSONL or CSV answer sheets ('-' for stdin JSONL)")
+    parser.add_argument("-o", "--output", default="-", help="JSONL or CSV results ('-' for stdout)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    try:
+        load_banks()  # fail fast before spawning workers
+    except BankLoadError as e:
+        sys.exit(str(e))
+
+    src = sys.stdin if args.sheets == "-" else open(args.sheets, "r", encoding="utf-8", newline="")
+    dst = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        try:
+            sheets = read_sheets(args.sheets, src)
+        except ValueError as e:
+            sys.exit(f"{args.sheets}: {e}")
+        writer = ResultWriter(args.output, dst)
+        n = grade_stream(sheets, writer.write, args.workers, args.chunk_size)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+    print(f"graded {n} sheets", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
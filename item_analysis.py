@@ -0,0 +1,214 @@
+# Attention Dynamics - Item Analysis
+# Offline, vectorized classical test theory over the response log: item
+# difficulty, point-biserial discrimination, distractor analysis, Cronbach's
+# alpha and calibration of the result band cutoffs. Requires NumPy.
+#
+# Usage: python item_analysis.py responses.log --kind pda
+
+import argparse
+import os
+from collections import namedtuple
+
+import numpy as np
+
+from quiz_engine import PDA_BANDS, QUIZ_BANDS
+from response_log import KIND_PDA, KIND_QUIZ, RECORD
+
+# Mirrors response_log.RECORD; numpy packs structured dtypes without padding
+RECORD_DTYPE = np.dtype([("timestamp", "<f8"), ("session", "<u4"), ("question", "<u4"),
+                         ("kind", "u1"), ("choice", "u1"), ("correct", "u1")])
+assert RECORD_DTYPE.itemsize == RECORD.size
+
+Responses = namedtuple("Responses", "session question choice correct")
+ItemReport = namedtuple("ItemReport", "attempts difficulty discrimination")
+DistractorReport = namedtuple("DistractorReport", "counts shares mean_rest")
+BandReport = namedtuple("BandReport", "cutoffs shares sem near_cutoff suggested")
+
+
+# ────────────────────────────────────────────────
+#                   LOADING
+# ────────────────────────────────────────────────
+def from_arrays(session, question, choice, correct, dense_sessions=False):
+    """Build a Responses set; session ids are renumbered 0..n-1 unless already dense."""
+    session = np.asarray(session)
+    if not dense_sessions:
+        _, session = np.unique(session, return_inverse=True)
+    return Responses(session.astype(np.intp, copy=False),
+                     np.asarray(question, dtype=np.intp),
+                     np.asarray(choice, dtype=np.intp),
+                     np.asarray(correct, dtype=np.float64))
+
+
+def load_log(path, kind):
+    """Memory-map a response log and keep the records of one kind."""
+    count = os.path.getsize(path) // RECORD_DTYPE.itemsize
+    if not count:
+        return from_arrays([], [], [], [], dense_sessions=True)
+    raw = np.memmap(path, dtype=RECORD_DTYPE, mode="r", shape=(count,))
+    raw = raw[raw["kind"] == kind]
+    return from_arrays(raw["session"], raw["question"], raw["choice"], raw["correct"])
+
+
+# ────────────────────────────────────────────────
+#                   SESSION SCORES
+# ────────────────────────────────────────────────
+def session_scores(r):
+    """Per-session answer count and percent correct."""
+    n = np.bincount(r.session)
+    correct = np.bincount(r.session, weights=r.correct, minlength=len(n))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return n, np.where(n > 0, 100.0 * correct / n, np.nan)
+
+
+def rest_scores(r):
+    """Proportion correct on the *other* answers of each response's session."""
+    n = np.bincount(r.session)
+    correct = np.bincount(r.session, weights=r.correct, minlength=len(n))
+    others = n[r.session] - 1
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(others > 0, (correct[r.session] - r.correct) / others, np.nan)
+
+
+def _grouped_corr(group, x, y, n_groups):
+    cnt = np.bincount(group, minlength=n_groups).astype(np.float64)
+    sx = np.bincount(group, x, n_groups)
+    sy = np.bincount(group, y, n_groups)
+    sxx = np.bincount(group, x * x, n_groups)
+    syy = np.bincount(group, y * y, n_groups)
+    sxy = np.bincount(group, x * y, n_groups)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = sxy / cnt - (sx / cnt) * (sy / cnt)
+        var_x = sxx / cnt - (sx / cnt) ** 2
+        var_y = syy / cnt - (sy / cnt) ** 2
+        corr = cov / np.sqrt(var_x * var_y)
+    corr[~np.isfinite(corr)] = np.nan
+    return corr
+
+
+# ────────────────────────────────────────────────
+#                   ITEM STATISTICS
+# ────────────────────────────────────────────────
+def item_statistics(r, n_items=None, rest=None):
+    """Difficulty (proportion correct) and point-biserial discrimination per item.
+
+    Discrimination correlates an item's correctness with the rest score of
+    the session it appeared in, so it also works with randomly sampled forms.
+    """
+    n_items = n_items or int(r.question.max()) + 1
+    rest = rest_scores(r) if rest is None else rest
+    attempts = np.bincount(r.question, minlength=n_items)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        difficulty = np.bincount(r.question, r.correct, n_items) / attempts
+    valid = ~np.isnan(rest)
+    discrimination = _grouped_corr(r.question[valid], r.correct[valid], rest[valid], n_items)
+    return ItemReport(attempts, difficulty, discrimination)
+
+
+def distractor_analysis(r, n_items=None, n_options=None, rest=None):
+    """Choice counts, shares and mean rest score of the choosers, per item and option.
+
+    ``n_options`` is widened to the largest choice seen, so an item with an
+    extra option can never spill into the next item's cells.
+    """
+    n_items = n_items or int(r.question.max()) + 1
+    n_options = max(n_options or 0, int(r.choice.max()) + 1 if len(r.choice) else 1)
+    rest = rest_scores(r) if rest is None else rest
+    cell = r.question * n_options + r.choice
+    size = n_items * n_options
+    counts = np.bincount(cell, minlength=size).reshape(n_items, n_options)
+    valid = ~np.isnan(rest)
+    rest_n = np.bincount(cell[valid], minlength=size).reshape(n_items, n_options)
+    rest_sum = np.bincount(cell[valid], rest[valid], size).reshape(n_items, n_options)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        shares = counts / counts.sum(axis=1, keepdims=True)
+        mean_rest = rest_sum / rest_n
+    return DistractorReport(counts, shares, mean_rest)
+
+
+def cronbach_alpha(r):
+    """KR-20 / Cronbach's alpha over sessions of the most common length.
+
+    Sessions draw different questions, so columns are answer positions; with
+    random forms this estimates the reliability of a session score.
+    """
+    n = np.bincount(r.session)
+    if not len(n):
+        return np.nan
+    k = int(np.argmax(np.bincount(n[n > 0])))
+    if k < 2:
+        return np.nan
+    order = np.argsort(r.session, kind="stable")
+    keep = n[r.session[order]] == k
+    matrix = r.correct[order][keep].reshape(-1, k)
+    if len(matrix) < 2:
+        return np.nan
+    item_var = matrix.var(axis=0, ddof=1).sum()
+    total_var = matrix.sum(axis=1).var(ddof=1)
+    if total_var == 0:
+        return np.nan
+    return k / (k - 1) * (1 - item_var / total_var)
+
+
+def band_calibration(percent, cutoffs, alpha, target_shares=None):
+    """Shares per result band, measurement error around each cutoff, suggested cutoffs.
+
+    ``cutoffs`` are highest first, as in quiz_engine. ``near_cutoff`` is the
+    fraction of sessions within one standard error of measurement of each
+    cutoff, i.e. those whose band is a coin flip. Given ``target_shares``
+    (top band first), ``suggested`` holds the cutoffs that would produce them.
+    """
+    percent = percent[~np.isnan(percent)]
+    cuts = np.asarray(cutoffs, dtype=np.float64)
+    at_or_above = (percent[:, None] >= cuts).mean(axis=0)
+    shares = np.diff(np.concatenate(([0.0], at_or_above, [1.0])))
+    sd = percent.std(ddof=1) if len(percent) > 1 else np.nan
+    sem = sd * np.sqrt(max(0.0, 1 - alpha)) if np.isfinite(alpha) else np.nan
+    near = (np.abs(percent[:, None] - cuts) < sem).mean(axis=0)
+    suggested = None
+    if target_shares is not None:
+        upper = np.cumsum(target_shares)[:-1]
+        suggested = np.percentile(percent, 100 * (1 - upper))
+    return BandReport(tuple(cutoffs), shares, sem, near, suggested)
+
+
+def analyze(r, cutoffs, n_items=None, n_options=None, target_shares=None):
+    rest = rest_scores(r)
+    items = item_statistics(r, n_items, rest)
+    distractors = distractor_analysis(r, len(items.attempts), n_options, rest)
+    alpha = cronbach_alpha(r)
+    _, percent = session_scores(r)
+    bands = band_calibration(percent, cutoffs, alpha, target_shares)
+    return items, distractors, alpha, bands
+
+
+# ────────────────────────────────────────────────
+#                   REPORT
+# ────────────────────────────────────────────────
+def main():
+    parser = argparse.ArgumentParser(description="Item analysis over a response log")
+    parser.add_argument("log", nargs="?", default="responses.log")
+    parser.add_argument("--kind", choices=("quiz", "pda"), default="pda")
+    parser.add_argument("--min-discrimination", type=float, default=0.2)
+    parser.add_argument("--target-shares", type=float, nargs=3, metavar=("TOP", "MID", "LOW"))
+    args = parser.parse_args()
+
+    kind, cutoffs = (KIND_PDA, PDA_BANDS) if args.kind == "pda" else (KIND_QUIZ, QUIZ_BANDS)
+    r = load_log(args.log, kind)
+    if not len(r.question):
+        raise SystemExit(f"No {args.kind} responses in {args.log}")
+    items, distractors, alpha, bands = analyze(r, cutoffs, target_shares=args.target_shares)
+
+    print(f"{len(r.question)} responses, {int(r.session.max()) + 1} sessions, alpha={alpha:.3f}")
+    print(f"bands {bands.cutoffs}: shares={np.round(bands.shares, 3).tolist()} "
+          f"SEM={bands.sem:.1f} pts near-cutoff={np.round(bands.near_cutoff, 3).tolist()}")
+    if bands.suggested is not None:
+        print(f"suggested cutoffs: {np.round(bands.suggested, 1).tolist()}")
+    weak = np.flatnonzero((items.attempts > 0) & ~(items.discrimination >= args.min_discrimination))
+    print(f"{len(weak)} items below discrimination {args.min_discrimination}:")
+    for q in weak:
+        print(f"  #{q:<5} n={items.attempts[q]:<6} p={items.difficulty[q]:.2f} "
+              f"r_pb={items.discrimination[q]:.2f} choices={np.round(distractors.shares[q], 2).tolist()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+# Attention Dynamics - Hot-Path Profiling
+# Opt-in latency histograms for Tk callbacks. When profiling is off nothing
+# is wrapped, so the callbacks run exactly as before.
+#
+# Enable with AURA_PROFILE=profile.json python quiz.py
+
+import json
+import os
+import time
+from array import array
+from functools import wraps
+
+# Log-linear (HDR-style) buckets: values below 128 get their own bucket,
+# above that each power of two is split into 64 sub-buckets (<1.6% error).
+SUB_BUCKETS = 64
+LINEAR_LIMIT = 2 * SUB_BUCKETS
+MAX_EXPONENT = 20                  # tops out around 134 s in microseconds
+N_BUCKETS = LINEAR_LIMIT + MAX_EXPONENT * SUB_BUCKETS
+MAX_VALUE = (2 * SUB_BUCKETS << MAX_EXPONENT) - 1
+
+PROFILE_ENV = "AURA_PROFILE"
+
+
+def bucket_index(value):
+    if value < LINEAR_LIMIT:
+        return value
+    exp = value.bit_length() - 7
+    return LINEAR_LIMIT + (exp - 1) * SUB_BUCKETS + (value >> exp) - SUB_BUCKETS
+
+
+def bucket_value(idx):
+    """Midpoint of the values that land in bucket ``idx``."""
+    if idx < LINEAR_LIMIT:
+        return idx
+    exp = (idx - LINEAR_LIMIT) // SUB_BUCKETS + 1
+    low = ((idx - LINEAR_LIMIT) % SUB_BUCKETS + SUB_BUCKETS) << exp
+    return low + ((1 << exp) - 1) // 2
+
+
+class Histogram:
+    """Fixed-memory histogram of non-negative integer samples."""
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.counts = array("Q", bytes(8 * N_BUCKETS))
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def record(self, value):
+        value = min(max(int(value), 0), MAX_VALUE)
+        self.counts[bucket_index(value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = max(self.max, value)
+
+    def percentile(self, pct):
+        if not self.count:
+            return 0
+        rank = max(1, -(-self.count * pct // 100))  # ceil
+        seen = 0
+        for idx, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(bucket_value(idx), self.max)
+        return self.max
+
+    def to_dict(self):
+        return {"count": self.count, "min": self.min or 0, "max": self.max,
+                "mean": self.total / self.count if self.count else 0,
+                "p50": self.percentile(50), "p90": self.percentile(90),
+                "p99": self.percentile(99), "p999": self.percentile(99.9),
+                "buckets": [[bucket_value(i), n] for i, n in enumerate(self.counts) if n]}
+
+
+class Profiler:
+    """Wraps named handlers and records their latency (µs) and widget churn."""
+
+    def __init__(self, export_path=None):
+        self.export_path = export_path
+        self.latency = {}       # handler -> Histogram of microseconds
+        self.widgets = {}       # handler -> Histogram of widgets created per call
+        self.widgets_created = 0
+        self._patched = None
+
+    @classmethod
+    def from_env(cls):
+        path = os.environ.get(PROFILE_ENV)
+        if not path:
+            return None
+        return cls("profile.json" if path == "1" else path)
+
+    def wrap(self, name, fn):
+        latency = self.latency.setdefault(name, Histogram())
+        widgets = self.widgets.setdefault(name, Histogram())
+
+        @wraps(fn)
+        def timed(*args, **kwargs):
+            created = self.widgets_created
+            t0 = time.perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                latency.record((time.perf_counter_ns() - t0) // 1000)
+                widgets.record(self.widgets_created - created)
+        return timed
+
+    def instrument(self, obj, names):
+        """Shadow ``obj``'s bound methods with timed wrappers.
+
+        Must run before the methods are handed to Tk as commands or bindings.
+        """
+        for name in names:
+            setattr(obj, name, self.wrap(name, getattr(obj, name)))
+
+    def track_widgets(self, widget_base):
+        """Count every widget constructed from ``widget_base`` (tk.BaseWidget)."""
+        original = widget_base.__init__
+        profiler = self
+
+        def counting_init(self, *args, **kwargs):
+            profiler.widgets_created += 1
+            original(self, *args, **kwargs)
+        widget_base.__init__ = counting_init
+        self._patched = (widget_base, original)
+
+    def readout(self):
+        """Short p50/p99 summary of the slowest handler so far, for the status bar."""
+        active = [(name, h) for name, h in self.latency.items() if h.count]
+        if not active:
+            return "PROFILE | no samples"
+        name, h = max(active, key=lambda item: item[1].percentile(99))
+        return (f"PROFILE | {name} p50 {h.percentile(50) / 1000:.2f} ms "
+                f"p99 {h.percentile(99) / 1000:.2f} ms (n={h.count})")
+
+    def export(self, path=None):
+        path = path or self.export_path
+        data = {"unit": "us", "widgets_created": self.widgets_created,
+                "handlers": {name: {"latency": h.to_dict(),
+                                    "widgets_per_call": self.widgets[name].to_dict()}
+                             for name, h in self.latency.items()}}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        return path
+
+    def close(self):
+        if self._patched is not None:
+            widget_base, original = self._patched
+            widget_base.__init__ = original
+            self._patched = None
+        if self.export_path:
+            self.export()
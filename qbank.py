@@ -0,0 +1,204 @@
+# Attention Dynamics - Compiled Question Banks
+# Compiles quiz_questions.json / PDA.json / tips.json into an indexed binary
+# file that is memory-mapped at load time and decoded one record at a time.
+#
+# Layout (all integers little-endian):
+#   header        magic, version, kind, record count, string count,
+#                 offset of the string table
+#   record index  (count + 1) x u32 offsets into the record area
+#   records       per-kind fixed fields followed by u32 string ids
+#   string index  (count + 1) x u32 offsets into the string blob
+#   string blob   interned UTF-8 strings
+#
+# Usage: python qbank.py quiz_questions.json PDA.json tips.json
+
+import mmap
+import os
+import struct
+import sys
+
+from quiz_engine import BankLoadError, read_json
+
+MAGIC = b"ADQB"
+VERSION = 1
+SUFFIX = ".qbank"
+
+KIND_QUIZ = 0
+KIND_PDA = 1
+KIND_TIPS = 2
+
+_HEADER = struct.Struct("<4sHHIII")
+_U32 = struct.Struct("<I")
+# question id, fixed-width correct field, option count
+_QUESTION = struct.Struct("<IHB")
+_TIP = struct.Struct("<III")
+
+
+def compiled_path(json_path):
+    return os.path.splitext(json_path)[0] + SUFFIX
+
+
+def _detect_kind(records):
+    if not records:
+        raise BankLoadError("Cannot compile an empty bank")
+    first = records[0]
+    if "title" in first:
+        return KIND_TIPS
+    if isinstance(first["options"], dict):
+        return KIND_PDA
+    return KIND_QUIZ
+
+
+# ────────────────────────────────────────────────
+#                   COMPILER
+# ────────────────────────────────────────────────
+class _StringTable:
+    def __init__(self):
+        self.ids = {}
+        self.strings = []
+
+    def intern(self, s):
+        sid = self.ids.get(s)
+        if sid is None:
+            sid = self.ids[s] = len(self.strings)
+            self.strings.append(s)
+        return sid
+
+
+def _encode_record(kind, r, strings):
+    sid = strings.intern
+    if kind == KIND_TIPS:
+        return _TIP.pack(sid(r["title"]), sid(r["description"]), sid(r["education"]))
+    if kind == KIND_PDA:
+        items = list(r["options"].items())
+        ids = [sid(x) for pair in items for x in pair]
+        head = _QUESTION.pack(sid(r["question"]), ord(r["correct"]), len(items))
+        return head + struct.pack(f"<{len(ids)}I", *ids)
+    ids = [sid(x) for x in r["options"]] + [sid(r["explanation"])]
+    head = _QUESTION.pack(sid(r["question"]), r["correct"], len(r["options"]))
+    return head + struct.pack(f"<{len(ids)}I", *ids)
+
+
+def compile_records(records, out_path):
+    kind = _detect_kind(records)
+    strings = _StringTable()
+    encoded = [_encode_record(kind, r, strings) for r in records]
+    blobs = [s.encode("utf-8") for s in strings.strings]
+
+    index_size = (len(encoded) + 1) * _U32.size
+    record_offsets, pos = [], _HEADER.size + index_size
+    for e in encoded:
+        record_offsets.append(pos)
+        pos += len(e)
+    record_offsets.append(pos)
+
+    strings_off = pos
+    string_offsets, spos = [], strings_off + (len(blobs) + 1) * _U32.size
+    for b in blobs:
+        string_offsets.append(spos)
+        spos += len(b)
+    string_offsets.append(spos)
+
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, kind, len(encoded), len(blobs), strings_off))
+        f.write(struct.pack(f"<{len(record_offsets)}I", *record_offsets))
+        f.writelines(encoded)
+        f.write(struct.pack(f"<{len(string_offsets)}I", *string_offsets))
+        f.writelines(blobs)
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+def compile_json(json_path, out_path=None):
+    return compile_records(read_json(json_path), out_path or compiled_path(json_path))
+
+
+# ────────────────────────────────────────────────
+#                   LOADER
+# ────────────────────────────────────────────────
+class CompiledBank:
+    """Sequence view over a memory-mapped compiled bank.
+
+    Records are decoded on ``__getitem__``, so only the questions a
+    session actually samples are ever turned into Python objects.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            with open(path, "rb") as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            raise BankLoadError(f"Cannot map compiled question bank: {path}") from None
+        if len(self._mm) < _HEADER.size or self._mm[:4] != MAGIC:
+            self._mm.close()
+            raise BankLoadError(f"Not a compiled question bank: {path}")
+        magic, version, kind, count, n_strings, strings_off = _HEADER.unpack_from(self._mm, 0)
+        if version != VERSION:
+            self._mm.close()
+            raise BankLoadError(f"Unsupported compiled bank version {version}: {path}")
+        self.kind = kind
+        self._count = count
+        self._strings_off = strings_off
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, idx):
+        if idx < 0:
+            idx += self._count
+        if not 0 <= idx < self._count:
+            raise IndexError("bank index out of range")
+        off = _U32.unpack_from(self._mm, _HEADER.size + idx * _U32.size)[0]
+        return self._decode(off)
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self[i]
+
+    def close(self):
+        self._mm.close()
+
+    def _string(self, sid):
+        start, end = struct.unpack_from("<II", self._mm, self._strings_off + sid * _U32.size)
+        return str(self._mm[start:end], "utf-8")
+
+    def _decode(self, off):
+        mm, s = self._mm, self._string
+        if self.kind == KIND_TIPS:
+            title, desc, edu = _TIP.unpack_from(mm, off)
+            return {"title": s(title), "description": s(desc), "education": s(edu)}
+
+        qid, correct, n = _QUESTION.unpack_from(mm, off)
+        off += _QUESTION.size
+        if self.kind == KIND_PDA:
+            ids = struct.unpack_from(f"<{2 * n}I", mm, off)
+            options = {s(ids[i]): s(ids[i + 1]) for i in range(0, 2 * n, 2)}
+            return {"question": s(qid), "options": options, "correct": chr(correct)}
+        ids = struct.unpack_from(f"<{n + 1}I", mm, off)
+        return {"question": s(qid), "options": [s(i) for i in ids[:n]],
+                "correct": correct, "explanation": s(ids[n])}
+
+
+def load_records(json_path):
+    """Return the compiled bank beside ``json_path`` if it is current, else the parsed JSON."""
+    bank_path = compiled_path(json_path)
+    if os.path.exists(bank_path):
+        try:
+            json_mtime = os.path.getmtime(json_path)
+        except OSError:
+            json_mtime = 0  # shipped without sources
+        if os.path.getmtime(bank_path) >= json_mtime:
+            return CompiledBank(bank_path)
+    return read_json(json_path)
+
+
+if __name__ == "__main__":
+    paths = sys.argv[1:] or ["quiz_questions.json", "PDA.json", "tips.json"]
+    for path in paths:
+        try:
+            out = compile_json(path)
+        except BankLoadError as e:
+            sys.exit(str(e))
+        print(f"{path} -> {out}")
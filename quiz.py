@@ -2,21 +2,88 @@
 # UI/UX: Futuristic space station corporate aesthetic
 
 import tkinter as tk
-from tkinter import messagebox, ttk
+from tkinter import ttk
+import os
+import queue
 import random
-import json
-
-# Helper function to load data from JSON files
+import threading
+import time
+
+from quiz_engine import (BankLoadError, PDA_OPTION_MAP_FWD, PDA_OPTION_MAP_REV,
+                         PDA_SESSION_LENGTH, PdaSession, QuestionBank, QuizSession)
+from content_pack import ContentPack, manifest_path
+from qbank import load_records
+from response_log import KIND_PDA, KIND_QUIZ, ResponseLog
+from sampler import WeightedSampler
+
+# Data banks, loaded on a worker thread in this order once the window is up
+BANK_FILES = (("tips", "tips.json"),
+              ("quiz", "quiz_questions.json"),
+              ("pda", "PDA.json"))
+LOAD_POLL_MS = 20
+PACK_POLL_MS = 2000  # how often packs/manifest.json is checked for edited shards
+TIP_SEARCH_RESULTS = 6
+
+# Tk callbacks timed when profiling is enabled (AURA_PROFILE=profile.json)
+HOT_PATHS = ("show_question", "check_answer", "show_pda_question", "check_pda_answer",
+             "_on_resize", "show_random_tip", "_on_tip_query")
+PROFILE_READOUT_MS = 1000
+RESPONSE_LOG = "responses.log"
+DEDUPE_INDEX = "banks.lsh"
+INDEX_REFRESH = 60.0  # seconds an adaptive item index is reused
+# A live session ends on these: a shard edited under it, a request the quiz
+# server rejected (e.g. the session expired) or an unreachable server
+SESSION_ERRORS = (BankLoadError, ValueError, OSError)
+
+def _messagebox():
+    # Imported on first use; most sessions never show a dialog
+    from tkinter import messagebox
+    return messagebox
+
+# Helper function to load data from JSON files (or their compiled .qbank form).
+# Runs off the Tk thread, so errors are returned rather than shown here.
 def load_data_from_json(filepath):
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        messagebox.showerror("Error", f"Data file not found: {filepath}")
-        return []
-    except json.JSONDecodeError:
-        messagebox.showerror("Error", f"Error decoding JSON from: {filepath}")
-        return []
+        return load_records(filepath), None
+    except BankLoadError as e:
+        return [], e
+
+def _load_error(error, what):
+    # Anything a loader raises reaches the user as a BankLoadError dialog
+    if isinstance(error, BankLoadError):
+        return error
+    return BankLoadError(f"Cannot load {what}: {error!r}")
+
+def load_bank(key, path, pack=None):
+    """Queue items for one bank, ``(key, records, error, groups)``; the tips also get their index.
+
+    A bank that fails to load (a shard edited without rebuilding the manifest,
+    a malformed record, ...) is delivered empty with the error, so the app
+    never waits on it.
+    """
+    try:
+        if pack is not None:
+            # Sized from the manifest; shards are parsed as questions are asked
+            records, error = pack.bank(key), None
+            path = manifest_path(pack.root)
+        else:
+            records, error = load_data_from_json(path)
+        # Near-duplicate groups, so a session never draws two versions of a question.
+        # dedupe (and NumPy with it) is only imported once the lint has been run;
+        # it reads every item, so with a pack it touches every shard once.
+        groups = ()
+        if key in ("quiz", "pda") and os.path.exists(DEDUPE_INDEX):
+            from dedupe import bank_clusters
+            groups = bank_clusters(key, records, DEDUPE_INDEX)
+        items = [(key, records, error, groups)]
+        if key == "tips":
+            from search_index import load_or_build
+            items.append(("tip_index", load_or_build(path, records), None, ()))
+    except Exception as e:
+        items = [(key, [], _load_error(e, f"the {key} bank"), ())]
+        if key == "tips":
+            items.append(("tip_index", None, None, ()))
+    return items
 
 
 
@@ -43,36 +110,173 @@ FONT_NORMAL = ("Consolas", 12)
 FONT_BUTTON = ("Consolas", 13, "bold")
 FONT_ITALIC = ("Consolas", 11, "italic")
 
+# ────────────────────────────────────────────────
+#                   BACKGROUND RENDERER
+# ────────────────────────────────────────────────
+class BackgroundRenderer:
+    """Draws the nebula-like gradient lines behind the main panel.
+
+    Resize events are coalesced: the redraw runs once, ``frame_ms`` after
+    the last ``<Configure>`` of a burst. Existing line items are moved with
+    ``coords()``; only the difference in line count is created or deleted.
+    """
+
+    FRAME_MS = 16
+    SPACING = 40
+
+    def __init__(self, canvas, frame_ms=FRAME_MS):
+        self.canvas = canvas
+        self.frame_ms = frame_ms
+        self.lines = []          # canvas item ids, left to right
+        self.redraw_count = 0    # number of redraws actually performed
+        self._pending = None
+        self._requested = None
+        self._drawn = None
+
+    def schedule(self, width, height):
+        self._requested = (width, height)
+        if self._pending is not None:
+            self.canvas.after_cancel(self._pending)
+        self._pending = self.canvas.after(self.frame_ms, self.flush)
+
+    def flush(self):
+        self._pending = None
+        if self._requested is None or self._requested == self._drawn:
+            return
+        width, height = self._requested
+        needed = len(range(0, width, self.SPACING))
+
+        while len(self.lines) < needed:
+            self.lines.append(self.canvas.create_line(0, 0, 0, 0, fill="#0f1a2a", width=80,
+                                                      stipple="gray75", tags="gradient_line"))
+        while len(self.lines) > needed:
+            self.canvas.delete(self.lines.pop())
+
+        for n, item in enumerate(self.lines):
+            x = n * self.SPACING
+            self.canvas.coords(item, x, 0, x + width // 6, height)
+
+        self._drawn = self._requested
+        self.redraw_count += 1
+
+# ────────────────────────────────────────────────
+#                   QUESTION VIEW
+# ────────────────────────────────────────────────
+class QuestionView:
+    """Persistent question/feedback/result screen for one tab.
+
+    Widgets are created once and updated in place with ``config()``; the
+    option pool only grows when a question has more options than any
+    question shown before.
+    """
+
+    def __init__(self, parent, variable, submit, advance, restart):
+        self.parent = parent
+        self.variable = variable
+
+        self.cycle_label = self._make(tk.Label, text="", font=("Consolas", 12, "bold"),
+                                      fg=COLOR_ACCENT, bg=COLOR_PANEL)
+        self.question_label = self._make(tk.Label, text="", font=FONT_NORMAL, fg=COLOR_TEXT,
+                                         bg=COLOR_PANEL, wraplength=620, justify="left")
+        self.option_pool = []
+        self.submit_button = self._button(submit, 25)
+        self.feedback_label = self._make(tk.Label, text="", font=FONT_NORMAL, bg=COLOR_PANEL,
+                                         wraplength=620, justify="left")
+        self.next_button = self._button(advance, 25)
+        self.result_label = self._make(tk.Label, text="", font=("Consolas", 14, "bold"),
+                                       fg=COLOR_ACCENT, bg=COLOR_PANEL, wraplength=620)
+        self.restart_button = self._button(restart, 30)
+        self._visible = []
+
+    def _make(self, widget_cls, **kw):
+        return widget_cls(self.parent, **kw)
+
+    def _button(self, spec, width):
+        text, command = spec
+        return self._make(tk.Button, text=text, font=FONT_BUTTON, bg=COLOR_BUTTON_BG, fg=COLOR_ACCENT,
+                          activebackground=COLOR_BUTTON_HL, relief="flat", bd=1, width=width,
+                          command=command)
+
+    def _show(self, layout):
+        for widget in self._visible:
+            widget.pack_forget()
+        for widget, pack_kw in layout:
+            widget.pack(**pack_kw)
+        self._visible = [widget for widget, _ in layout]
+
+    def show_question(self, cycle_text, question_text, options):
+        # options: list of (label, radiobutton value)
+        while len(self.option_pool) < len(options):
+            self.option_pool.append(self._make(tk.Radiobutton, variable=self.variable,
+                                               font=FONT_NORMAL, bg=COLOR_PANEL, fg=COLOR_TEXT,
+                                               selectcolor=COLOR_PANEL, activebackground=COLOR_PANEL,
+                                               activeforeground=COLOR_ACCENT))
+        self.cycle_label.config(text=cycle_text)
+        self.question_label.config(text=question_text)
+        layout = [(self.cycle_label, dict(anchor="w", pady=6)),
+                  (self.question_label, dict(anchor="w", pady=12))]
+        for rb, (label, value) in zip(self.option_pool, options):
+            rb.config(text=label, value=value)
+            layout.append((rb, dict(anchor="w", pady=4)))
+        layout.append((self.submit_button, dict(pady=25)))
+        self._show(layout)
+
+    def show_feedback(self, message, color):
+        self.feedback_label.config(text=message, fg=color)
+        self._show([(self.feedback_label, dict(pady=15)),
+                    (self.next_button, dict(pady=20))])
+
+    def show_result(self, message):
+        self.result_label.config(text=message)
+        self._show([(self.result_label, dict(pady=40)),
+                    (self.restart_button, dict(pady=10))])
+
 # ────────────────────────────────────────────────
 #                   MAIN APP
 # ────────────────────────────────────────────────
 class AttentionApp:
-    def __init__(self, root):
+    def __init__(self, root, started=None, profiler=None, log_path=RESPONSE_LOG, remote=None):
+        self.started = time.perf_counter() if started is None else started
         self.root = root
+        # Wrap hot paths before any of them is handed to Tk as a command
+        self.profiler = profiler
+        if profiler is not None:
+            profiler.instrument(self, HOT_PATHS)
+            profiler.track_widgets(tk.BaseWidget)
         self.root.title("ATTENTION DYNAMICS // ORBITAL SOCIAL DIVISION v1.7")
         self.root.configure(bg=COLOR_BG)
         self.root.resizable(True, True)
 
-        self.tips = load_data_from_json('tips.json')
-        self.quiz_questions = load_data_from_json('quiz_questions.json')
-        self.pda_questions = load_data_from_json('PDA.json')
-        
-        self.quiz_score = 0
-        self.current_question_idx = 0
+        # Filled in by _on_bank_loaded as the loader thread delivers each file
+        self.tips = []
+        self.tip_index = None
+        self.quiz_questions = QuestionBank([])
+        self.pda_questions = QuestionBank([])
+        self.quiz_sampler = None  # spaced-repetition weights, one per bank
+        self.pda_sampler = None
+        self._pda_index = None  # (built at, ItemInformationIndex) for adaptive PDA
+        self.pack = None  # ContentPack when packs/manifest.json exists
+        self.remote = remote  # RemoteClient when sessions are served by server.py
+        # Remote sessions are logged by the server, so only local mode keeps a log
+        self.response_log = ResponseLog(log_path) if remote is None else None
+        self.first_paint_ms = None
+        self.data_ready_ms = None
+
+        # Session state lives in the engine; the app only holds the live sessions
+        self.quiz_session = None
         self.selected_option = tk.IntVar(value=-1)
-        self.pda_score = 0
-        self.current_pda_question_idx = 0
+        self.pda_session = None
         self.selected_pda_option = tk.IntVar(value=-1)
-        self.current_pda_questions = []
+        self.pda_adaptive = tk.BooleanVar(value=False)  # adaptive mode may stop before 20 cycles
 
-        self.pda_option_map_rev = {'A': 0, 'B': 1, 'C': 2, 'D': 3}
-        self.pda_option_map_fwd = {0: 'A', 1: 'B', 2: 'C', 3: 'D'}
+        self.pda_option_map_rev = PDA_OPTION_MAP_REV
+        self.pda_option_map_fwd = PDA_OPTION_MAP_FWD
 
         # ── Background canvas ──
         self.canvas = tk.Canvas(root, highlightthickness=0, bg=COLOR_BG)
         self.canvas.pack(fill="both", expand=True)
+        self.background = BackgroundRenderer(self.canvas) # Reuses gradient lines across resizes
         self.canvas.bind("<Configure>", self._on_resize)
-        self.gradient_lines = [] # To store gradient lines for redrawing
 
         # ── Main container (frame for content) ──
         # This frame will be placed on top of the canvas
@@ -100,17 +304,76 @@ class AttentionApp:
         self.notebook = ttk.Notebook(main_frame)
         self.notebook.pack(pady=10, padx=15, fill="both", expand=True)
 
-        # ── Tips Tab ──
+        # Tab contents are built on first selection (see _on_tab_changed)
         self.tip_frame = tk.Frame(self.notebook, bg=COLOR_PANEL)
         self.notebook.add(self.tip_frame, text=" PROTOCOLS ")
+        self.quiz_frame = tk.Frame(self.notebook, bg=COLOR_PANEL)
+        self.notebook.add(self.quiz_frame, text=" EVALUATION ")
+        self.pda_frame = tk.Frame(self.notebook, bg=COLOR_PANEL)
+        self.notebook.add(self.pda_frame, text=" PDA ")
+        self.tab_keys = {self.tip_frame: "tips", self.quiz_frame: "quiz", self.pda_frame: "pda"}
+        self.tab_builders = {"tips": self._build_tips_tab, "quiz": self._build_quiz_tab,
+                             "pda": self._build_pda_tab}
+        self.tabs_built = set()
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+
+        # Status bar
+        self.status_var = tk.StringVar(value="SYSTEM STANDBY | Loading data banks")
+        tk.Label(root, textvariable=self.status_var, font=("Consolas", 10),
+                 fg=COLOR_TEXT_DIM, bg=COLOR_BG, anchor="w").place(relx=0.03, rely=0.97, relwidth=0.7, anchor="sw")
 
+        tk.Button(root, text="TERMINATE", font=FONT_BUTTON,
+                  bg="#3a1a1a", fg="#ff4d4d", activebackground="#551111", relief="flat", bd=1, width=12,
+                  command=root.quit).place(relx=0.97, rely=0.97, anchor="se")
+
+        # Tabs stay disabled until their bank arrives from the loader thread
+        self.bank_tabs = {"tips": self.tip_frame, "quiz": self.quiz_frame, "pda": self.pda_frame}
+        for frame in self.bank_tabs.values():
+            self.notebook.tab(frame, state="disabled")
+
+        self._load_queue = queue.Queue()
+        self._banks_pending = len(BANK_FILES) + 2  # + the content pack and the tips search index
+        threading.Thread(target=self._load_banks, name="bank-loader", daemon=True).start()
+        self.root.after_idle(self._on_tab_changed)  # the initially selected tab
+        self.root.after_idle(self._mark_first_paint)
+        self.root.after(LOAD_POLL_MS, self._poll_banks)
+        if profiler is not None:
+            self.root.after(PROFILE_READOUT_MS, self._show_profile)
+
+    # ── Tab construction ──
+    def _on_tab_changed(self, _event=None):
+        key = self.tab_keys.get(self.notebook.nametowidget(self.notebook.select()))
+        if key is not None and key not in self.tabs_built:
+            self.tabs_built.add(key)
+            self.tab_builders[key]()
+            self._refresh_tab(key)
+
+    def _build_tips_tab(self):
         tk.Label(self.tip_frame, text="Select protocol insight", font=FONT_NORMAL,
                  fg=COLOR_ACCENT, bg=COLOR_PANEL).pack(pady=12)
 
-        tk.Button(self.tip_frame, text="QUERY RANDOM PROTOCOL", font=FONT_BUTTON,
-                  bg=COLOR_BUTTON_BG, fg=COLOR_ACCENT, activebackground=COLOR_BUTTON_HL,
-                  activeforeground=COLOR_ACCENT, relief="flat", bd=1, width=28,
-                  command=self.show_random_tip).pack(pady=8)
+        self.random_tip_button = tk.Button(self.tip_frame, text="QUERY RANDOM PROTOCOL", font=FONT_BUTTON,
+                                           bg=COLOR_BUTTON_BG, fg=COLOR_ACCENT, activebackground=COLOR_BUTTON_HL,
+                                           activeforeground=COLOR_ACCENT, relief="flat", bd=1, width=28,
+                                           state="disabled", command=self.show_random_tip)
+        self.random_tip_button.pack(pady=8)
+
+        # As-you-type search over the protocol index
+        search_row = tk.Frame(self.tip_frame, bg=COLOR_PANEL)
+        search_row.pack(pady=(4, 0))
+        tk.Label(search_row, text="SEARCH:", font=FONT_NORMAL,
+                 fg=COLOR_TEXT_DIM, bg=COLOR_PANEL).pack(side="left", padx=(0, 6))
+        self.tip_query_var = tk.StringVar()
+        self.tip_search_entry = tk.Entry(search_row, textvariable=self.tip_query_var, font=FONT_NORMAL,
+                                         bg=COLOR_BUTTON_BG, fg=COLOR_TEXT, insertbackground=COLOR_ACCENT,
+                                         relief="flat", width=36, state="disabled")
+        self.tip_search_entry.pack(side="left")
+        self.tip_results_list = tk.Listbox(self.tip_frame, font=FONT_NORMAL, height=TIP_SEARCH_RESULTS,
+                                           bg=COLOR_BUTTON_BG, fg=COLOR_TEXT, selectbackground=COLOR_ACCENT_DIM,
+                                           relief="flat", highlightthickness=0, activestyle="none", width=50)
+        self.tip_results = []  # doc ids shown in the list, best first
+        self.tip_query_var.trace_add("write", self._on_tip_query)
+        self.tip_results_list.bind("<<ListboxSelect>>", self._on_tip_result_selected)
 
         self.tip_title_label = tk.Label(self.tip_frame, text="", font=("Consolas", 15, "bold"),
                                         fg=COLOR_ACCENT, bg=COLOR_PANEL, wraplength=620)
@@ -124,10 +387,7 @@ class AttentionApp:
                                       fg=COLOR_TEXT_DIM, bg=COLOR_PANEL, wraplength=620, justify="left")
         self.tip_edu_label.pack(pady=12)
 
-        # ── Quiz Tab ──
-        self.quiz_frame = tk.Frame(self.notebook, bg=COLOR_PANEL)
-        self.notebook.add(self.quiz_frame, text=" EVALUATION ")
-
+    def _build_quiz_tab(self):
         # Frame for question selection controls (spinbox and start button)
         self.quiz_controls_frame = tk.Frame(self.quiz_frame, bg=COLOR_PANEL)
         self.quiz_controls_frame.pack(pady=(30, 0), padx=20, fill="x")
@@ -135,304 +395,415 @@ class AttentionApp:
         tk.Label(self.quiz_controls_frame, text="Select number of questions:", font=FONT_NORMAL,
                  fg=COLOR_TEXT, bg=COLOR_PANEL).pack(pady=(0, 5))
         
-        self.num_questions_var = tk.IntVar(value=min(20, len(self.quiz_questions)))
-        self.num_questions_spinbox = ttk.Spinbox(self.quiz_controls_frame, from_=1, to=len(self.quiz_questions),
+        # Bounds and button text are filled in by _refresh_tab once the quiz bank arrives
+        self.num_questions_var = tk.IntVar(value=0)
+        self.num_questions_spinbox = ttk.Spinbox(self.quiz_controls_frame, from_=1, to=1,
                                                  textvariable=self.num_questions_var, width=5,
                                                  font=FONT_NORMAL, state="readonly")
         self.num_questions_spinbox.pack(pady=5)
 
         self.start_quiz_button = tk.Button(self.quiz_controls_frame,
-                                           text=f"INITIATE BEHAVIORAL EVALUATION ({len(self.quiz_questions)} CYCLES)",
+                                           text="LOADING EVALUATION BANK...",
                                            font=FONT_BUTTON, bg=COLOR_BUTTON_BG, fg=COLOR_ACCENT,
                                            activebackground=COLOR_BUTTON_HL, relief="flat", bd=1, width=40,
-                                           command=self.start_quiz)
+                                           state="disabled", command=self.start_quiz)
         self.start_quiz_button.pack(pady=10) # Adjust padding as needed
 
         # Frame for displaying questions and results (this is the dynamic part)
         self.quiz_container = tk.Frame(self.quiz_frame, bg=COLOR_PANEL)
         self.quiz_container.pack(pady=(10, 30), padx=20, fill="both", expand=True)
+        self.quiz_view = QuestionView(self.quiz_container, self.selected_option,
+                                      submit=("SUBMIT RESPONSE", self.check_answer),
+                                      advance=("NEXT CYCLE", self.next_question),
+                                      restart=("RE-INITIALIZE EVALUATION", self.start_quiz))
 
-        # ── PDA Tab ──
-        self.pda_frame = tk.Frame(self.notebook, bg=COLOR_PANEL)
-        self.notebook.add(self.pda_frame, text=" PDA ")
-
+    def _build_pda_tab(self):
         # Frame for PDA controls (start button)
         self.pda_controls_frame = tk.Frame(self.pda_frame, bg=COLOR_PANEL)
         self.pda_controls_frame.pack(pady=(30, 0), padx=20, fill="x")
 
         tk.Label(self.pda_controls_frame, text="Personality Dynamics Analysis", font=FONT_NORMAL,
                  fg=COLOR_ACCENT, bg=COLOR_PANEL).pack(pady=(0, 5))
-        tk.Label(self.pda_controls_frame, text="This evaluation consists of 20 questions.", font=FONT_NORMAL,
+        tk.Label(self.pda_controls_frame, text=f"This evaluation consists of {PDA_SESSION_LENGTH} questions.", font=FONT_NORMAL,
                  fg=COLOR_TEXT_DIM, bg=COLOR_PANEL).pack(pady=(0, 10))
+        tk.Checkbutton(self.pda_controls_frame, text="ADAPTIVE MODE (ends once the result is clear)",
+                       variable=self.pda_adaptive, command=self._update_pda_button, font=FONT_NORMAL,
+                       bg=COLOR_PANEL, fg=COLOR_TEXT, selectcolor=COLOR_PANEL, activebackground=COLOR_PANEL,
+                       activeforeground=COLOR_ACCENT).pack(pady=(0, 5))
 
         self.start_pda_quiz_button = tk.Button(self.pda_controls_frame,
-                                               text=f"INITIATE PDA EVALUATION (20 CYCLES)",
+                                               text=self._pda_button_text(),
                                                font=FONT_BUTTON, bg=COLOR_BUTTON_BG, fg=COLOR_ACCENT,
                                                activebackground=COLOR_BUTTON_HL, relief="flat", bd=1, width=40,
-                                               command=self.start_pda_quiz)
+                                               state="disabled", command=self.start_pda_quiz)
         self.start_pda_quiz_button.pack(pady=10)
 
         # Frame for displaying PDA questions and results
         self.pda_container = tk.Frame(self.pda_frame, bg=COLOR_PANEL)
         self.pda_container.pack(pady=(10, 30), padx=20, fill="both", expand=True)
-
-
-
-        # Status bar
-        self.status_var = tk.StringVar(value="SYSTEM STANDBY | Awaiting input")
-        tk.Label(root, textvariable=self.status_var, font=("Consolas", 10),
-                 fg=COLOR_TEXT_DIM, bg=COLOR_BG, anchor="w").place(relx=0.03, rely=0.97, relwidth=0.7, anchor="sw")
-
-        tk.Button(root, text="TERMINATE", font=FONT_BUTTON,
-                  bg="#3a1a1a", fg="#ff4d4d", activebackground="#551111", relief="flat", bd=1, width=12,
-                  command=root.quit).place(relx=0.97, rely=0.97, anchor="se")
+        self.pda_view = QuestionView(self.pda_container, self.selected_pda_option,
+                                     submit=("SUBMIT PDA RESPONSE", self.check_pda_answer),
+                                     advance=("NEXT PDA CYCLE", self.next_pda_question),
+                                     restart=("RE-INITIALIZE PDA EVALUATION", self.start_pda_quiz))
+
+    def _pda_button_text(self):
+        if self.pda_adaptive.get():
+            return f"INITIATE ADAPTIVE PDA EVALUATION (UP TO {PDA_SESSION_LENGTH} CYCLES)"
+        return f"INITIATE PDA EVALUATION ({PDA_SESSION_LENGTH} CYCLES)"
+
+    def _update_pda_button(self):
+        self.start_pda_quiz_button.config(text=self._pda_button_text())
+
+    def _refresh_tab(self, key):
+        # Bring a built tab's controls in line with the data loaded so far
+        if key == "tips":
+            self.random_tip_button.config(state="normal" if len(self.tips) else "disabled")
+            self.tip_search_entry.config(state="normal" if self.tip_index else "disabled")
+        elif key == "quiz":
+            n = len(self.quiz_questions)
+            self.num_questions_spinbox.config(to=max(1, n))
+            self.num_questions_var.set(min(20, n))
+            self.start_quiz_button.config(state="normal" if n else "disabled",
+                                          text=f"INITIATE BEHAVIORAL EVALUATION ({n} CYCLES)" if n
+                                          else "LOADING EVALUATION BANK...")
+        elif key == "pda":
+            self.start_pda_quiz_button.config(state="normal" if len(self.pda_questions) else "disabled")
+
+    # ── Background data loading ──
+    def _load_banks(self):
+        # Worker thread: never touches Tk, only the queue. The response log is
+        # replayed first, before any tab that could append to it is enabled.
+        if self.remote is not None:
+            self._load_remote_banks()
+            return
+        pack, error = None, None
+        try:
+            self.response_log.replay()
+        except Exception as e:  # stats start empty; new answers are still logged
+            error = _load_error(e, f"the response log {self.response_log.path}")
+        if ContentPack.exists():
+            try:
+                pack = ContentPack()
+            except Exception as e:
+                error = _load_error(e, "the content pack")  # fall back to the monolithic bank files
+        self._load_queue.put(("pack", pack, error, ()))
+        self._load_bank_files(BANK_FILES, pack)
+
+    def _load_bank_files(self, banks, pack):
+        for key, path in banks:
+            for item in load_bank(key, path, pack):
+                self._load_queue.put(item)
+
+    def _load_remote_banks(self):
+        # Thin client: only the tips and the bank sizes come over the wire
+        from search_index import SearchIndex
+        from remote import RemoteBank
+        try:
+            sizes, tips, error = self.remote.bank_sizes(), self.remote.tips(), None
+        except (OSError, ValueError) as e:
+            sizes, tips = {}, []
+            error = BankLoadError(f"Cannot reach quiz server {self.remote.url}: {e}")
+        self._load_queue.put(("pack", None, error, ()))
+        for key, _ in BANK_FILES:
+            records = tips if key == "tips" else RemoteBank(sizes.get(key, 0))
+            self._load_queue.put((key, records, None, ()))
+        try:
+            index, error = SearchIndex.build(tips), None
+        except Exception as e:  # tips the server sent in the wrong shape
+            index, error = None, _load_error(e, "the tips search index")
+        self._load_queue.put(("tip_index", index, error, ()))
+
+    def _poll_banks(self):
+        while True:
+            try:
+                key, records, error, groups = self._load_queue.get_nowait()
+            except queue.Empty:
+                break
+            self._on_bank_loaded(key, records, error, groups)
+        if self._banks_pending:
+            self.root.after(LOAD_POLL_MS, self._poll_banks)
+
+    def _check_pack(self):
+        # Edited shards show up as new hashes in the manifest; reload just those banks
+        if not self._banks_pending:
+            try:
+                changed = self.pack.refresh()
+            except BankLoadError as e:
+                changed = ()
+                self.status_var.set(f"CONTENT PACK ERROR | {e}")
+            banks = [(key, path) for key, path in BANK_FILES if key in changed]
+            if banks:
+                self._banks_pending += len(banks) + any(key == "tips" for key, _ in banks)
+                threading.Thread(target=self._load_bank_files, args=(banks, self.pack),
+                                 name="pack-reloader", daemon=True).start()
+                self.root.after(LOAD_POLL_MS, self._poll_banks)
+        self.root.after(PACK_POLL_MS, self._check_pack)
+
+    def _show_profile(self):
+        # Keep the app's own status text and append the live p50/p99 readout
+        status = self.status_var.get().split(" || ")[0]
+        self.status_var.set(f"{status} || {self.profiler.readout()}")
+        self.root.after(PROFILE_READOUT_MS, self._show_profile)
+
+    def _elapsed_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def _mark_first_paint(self):
+        self.first_paint_ms = self._elapsed_ms()
+        if self._banks_pending:
+            self.status_var.set(f"SYSTEM STANDBY | Loading data banks | First paint {self.first_paint_ms:.0f} ms")
+
+    def _on_bank_loaded(self, key, records, error, groups=()):
+        self._banks_pending -= 1
+        if error is not None:
+            _messagebox().showerror("Error", str(error))
+
+        tab = key
+        if key == "pack":
+            self.pack = records
+            if records is not None:
+                self.root.after(PACK_POLL_MS, self._check_pack)
+        elif key == "tips":
+            self.tips = records
+        elif key == "tip_index":
+            self.tip_index = records
+            tab = "tips"
+        elif key == "quiz":
+            self.quiz_questions = QuestionBank(records)
+            self.quiz_sampler = self._new_sampler(KIND_QUIZ, len(self.quiz_questions), groups)
+        elif key == "pda":
+            self.pda_questions = QuestionBank(records)
+            self.pda_sampler = self._new_sampler(KIND_PDA, len(self.pda_questions), groups)
+            self._pda_index = None  # difficulties are per item, so rebuild for the new bank
+
+        if tab in self.tabs_built:
+            self._refresh_tab(tab)
+        if key in self.bank_tabs:
+            self.notebook.tab(self.bank_tabs[key], state="normal" if len(records) else "disabled")
+
+        if not self._banks_pending:
+            if self.data_ready_ms is not None:
+                self.status_var.set("CONTENT PACK UPDATED | Edited shards reloaded")
+                return
+            self.data_ready_ms = self._elapsed_ms()
+            first_paint = f"{self.first_paint_ms:.0f} ms" if self.first_paint_ms is not None else "n/a"
+            self.status_var.set(f"SYSTEM STANDBY | Awaiting input | First paint {first_paint}, "
+                                f"data ready {self.data_ready_ms:.0f} ms")
+
+    def _new_sampler(self, kind, n, groups):
+        # A question's Leitner box is its run of correct answers, so the boxes
+        # survive restarts and pack reloads by being rebuilt from the log
+        sampler = WeightedSampler(n)
+        if self.response_log is not None:
+            sampler.set_boxes(self.response_log.streak(kind, idx) for idx in range(n))
+        sampler.set_clusters(groups)
+        return sampler
 
     def _on_resize(self, event):
-        # Redraw the subtle nebula-like gradient lines on resize
-        self.canvas.delete("gradient_line") # Delete old lines
-
-        width = event.width
-        height = event.height
-
-        # Redraw gradient lines to fill new canvas size
-        for i in range(0, width, 40):
-            self.canvas.create_line(i, 0, i + width // 6, height, fill="#0f1a2a", width=80, stipple="gray75", tags="gradient_line")
+        # Redraw the subtle nebula-like gradient lines once the resize burst settles
+        self.background.schedule(event.width, event.height)
 
     def show_random_tip(self):
-        tip = random.choice(self.tips)
+        self.show_tip(random.choice(self.tips))
+        self.status_var.set("PROTOCOL RETRIEVED | Cycle complete")
+
+    def show_tip(self, tip):
         self.tip_title_label.config(text="► " + tip["title"])
         self.tip_desc_label.config(text=tip["description"])
         self.tip_edu_label.config(text="NEURO-PSYCH ANALYSIS: " + tip["education"])
-        self.status_var.set("PROTOCOL RETRIEVED | Cycle complete")
+
+    def _on_tip_query(self, *_):
+        query = self.tip_query_var.get()
+        t0 = time.perf_counter()
+        hits = self.tip_index.search(query, TIP_SEARCH_RESULTS) if self.tip_index else []
+        elapsed_ms = (time.perf_counter() - t0) * 1000
+
+        self.tip_results = [doc_id for doc_id, _ in hits]
+        self.tip_results_list.delete(0, "end")
+        for doc_id in self.tip_results:
+            self.tip_results_list.insert("end", self.tips[doc_id]["title"])
+        if query.strip():
+            self.tip_results_list.pack(pady=(4, 0), before=self.tip_title_label)
+            self.status_var.set(f"PROTOCOL SEARCH | {len(hits)} matches in {elapsed_ms:.2f} ms")
+        else:
+            self.tip_results_list.pack_forget()
+
+    def _on_tip_result_selected(self, _event):
+        selection = self.tip_results_list.curselection()
+        if selection:
+            self.show_tip(self.tips[self.tip_results[selection[0]]])
+            self.status_var.set("PROTOCOL RETRIEVED | Search result")
 
     def start_quiz(self):
         try:
             num_selected_questions = self.num_questions_var.get()
-            if not (1 <= num_selected_questions <= len(self.quiz_questions)):
-                messagebox.showwarning("Invalid Input", f"Please select a number between 1 and {len(self.quiz_questions)}.")
-                return
+            if self.remote is not None:
+                self.quiz_session = self.remote.start("quiz", num_selected_questions)
+            else:
+                self.quiz_session = QuizSession.start(self.quiz_questions, num_selected_questions,
+                                                    sampler=self.quiz_sampler, log=self.response_log)
         except tk.TclError:
-            messagebox.showwarning("Invalid Input", "Please enter a valid number for questions.")
+            _messagebox().showwarning("Invalid Input", "Please enter a valid number for questions.")
+            return
+        except ValueError as e:
+            _messagebox().showwarning("Invalid Input", str(e))
+            return
+        except OSError as e:
+            _messagebox().showerror("Server Error", str(e))
             return
-        
-        self.current_quiz_questions = random.sample(self.quiz_questions, num_selected_questions)
 
-        self.quiz_score = 0
-        self.current_question_idx = 0
         self.selected_option.set(-1)
         self.quiz_controls_frame.pack_forget() # Hide the entire controls frame
         self.show_question()
 
     def start_pda_quiz(self):
-        self.pda_score = 0
-        self.current_pda_question_idx = 0
-        self.selected_pda_option.set(-1)
-        
-        # PDA quiz always has 20 questions
-        if len(self.pda_questions) < 20:
-            messagebox.showwarning("PDA Error", "Not enough PDA questions available (need 20).")
+        try:
+            if self.remote is not None:
+                self.pda_session = self.remote.start("pda", adaptive=self.pda_adaptive.get())
+            elif self.pda_adaptive.get():
+                from adaptive import AdaptivePdaSession
+                self.pda_session = AdaptivePdaSession.start(self.pda_questions, self._item_index(),
+                                                            sampler=self.pda_sampler, log=self.response_log)
+            else:
+                self.pda_session = PdaSession.start(self.pda_questions, sampler=self.pda_sampler,
+                                                  log=self.response_log)
+        except ValueError as e:
+            _messagebox().showwarning("PDA Error", str(e))
             return
-        self.current_pda_questions = random.sample(self.pda_questions, 20)
-        
+        except OSError as e:
+            _messagebox().showerror("Server Error", str(e))
+            return
+
+        self.selected_pda_option.set(-1)
         self.pda_controls_frame.pack_forget() # Hide the entire PDA controls frame
         self.show_pda_question()
 
-    def show_question(self):
-        for widget in self.quiz_container.winfo_children():
-            widget.destroy()
+    def _item_index(self):
+        # Item difficulties reflect the answers logged up to the last rebuild
+        from adaptive import ItemInformationIndex
+        now = time.monotonic()
+        if self._pda_index is None or now - self._pda_index[0] > INDEX_REFRESH:
+            self._pda_index = (now, ItemInformationIndex.from_log(len(self.pda_questions), self.response_log))
+        return self._pda_index[1]
 
-        if self.current_question_idx >= len(self.current_quiz_questions):
+    def show_question(self):
+        session = self.quiz_session
+        if session.finished:
             self.show_quiz_results()
             return
 
-        q = self.current_quiz_questions[self.current_question_idx]
-
-        tk.Label(self.quiz_container, text=f"CYCLE {self.current_question_idx+1}/{len(self.current_quiz_questions)}",
-                 font=("Consolas", 12, "bold"), fg=COLOR_ACCENT, bg=COLOR_PANEL).pack(anchor="w", pady=6)
-
-        tk.Label(self.quiz_container, text=q["question"], font=FONT_NORMAL,
-                 fg=COLOR_TEXT, bg=COLOR_PANEL, wraplength=620, justify="left").pack(anchor="w", pady=12)
-
-        for i, option in enumerate(q["options"]):
-            rb = tk.Radiobutton(self.quiz_container, text=option, variable=self.selected_option, value=i,
-                                font=FONT_NORMAL, bg=COLOR_PANEL, fg=COLOR_TEXT,
-                                selectcolor=COLOR_PANEL, activebackground=COLOR_PANEL,
-                                activeforeground=COLOR_ACCENT)
-            rb.pack(anchor="w", pady=4)
-
-        tk.Button(self.quiz_container, text="SUBMIT RESPONSE", font=FONT_BUTTON,
-                  bg=COLOR_BUTTON_BG, fg=COLOR_ACCENT, activebackground=COLOR_BUTTON_HL,
-                  relief="flat", bd=1, width=25,
-                  command=self.check_answer).pack(pady=25)
+        try:
+            q = session.current()
+        except SESSION_ERRORS as e:
+            self._abort_session(self.quiz_view, self.quiz_controls_frame, e)
+            return
+        self.quiz_view.show_question(f"CYCLE {session.position+1}/{len(session)}", q["question"],
+                                     [(option, i) for i, option in enumerate(q["options"])])
 
     def show_pda_question(self):
-        for widget in self.pda_container.winfo_children():
-            widget.destroy()
-
-        if self.current_pda_question_idx >= len(self.current_pda_questions):
+        session = self.pda_session
+        if session.finished:
             self.show_pda_results()
             return
 
-        q = self.current_pda_questions[self.current_pda_question_idx]
-
-        tk.Label(self.pda_container, text=f"PDA CYCLE {self.current_pda_question_idx+1}/{len(self.current_pda_questions)}",
-                 font=("Consolas", 12, "bold"), fg=COLOR_ACCENT, bg=COLOR_PANEL).pack(anchor="w", pady=6)
-
-        tk.Label(self.pda_container, text=q["question"], font=FONT_NORMAL,
-                 fg=COLOR_TEXT, bg=COLOR_PANEL, wraplength=620, justify="left").pack(anchor="w", pady=12)
-        
-        self.pda_option_map_rev = {'A': 0, 'B': 1, 'C': 2, 'D': 3} # Map for converting letter to int for radiobutton value
-        self.pda_option_map_fwd = {0: 'A', 1: 'B', 2: 'C', 3: 'D'} # Map for converting int back to letter for checking
-
-        for letter, text in q["options"].items():
-            rb = tk.Radiobutton(self.pda_container, text=f"{letter}. {text}", variable=self.selected_pda_option, value=self.pda_option_map_rev[letter],
-                                font=FONT_NORMAL, bg=COLOR_PANEL, fg=COLOR_TEXT,
-                                selectcolor=COLOR_PANEL, activebackground=COLOR_PANEL,
-                                activeforeground=COLOR_ACCENT)
-            rb.pack(anchor="w", pady=4)
-
-        tk.Button(self.pda_container, text="SUBMIT PDA RESPONSE", font=FONT_BUTTON,
-                  bg=COLOR_BUTTON_BG, fg=COLOR_ACCENT, activebackground=COLOR_BUTTON_HL,
-                  relief="flat", bd=1, width=25,
-                  command=self.check_pda_answer).pack(pady=25)
+        try:
+            q = session.current()
+        except SESSION_ERRORS as e:
+            self._abort_session(self.pda_view, self.pda_controls_frame, e)
+            return
+        cycle = f"PDA CYCLE {session.position+1}/{len(session)}"
+        if hasattr(session, "max_items"):  # adaptive: the final length is not known yet
+            cycle = f"ADAPTIVE PDA CYCLE {session.position+1} (max {session.max_items})"
+        self.pda_view.show_question(cycle, q["question"],
+                                    [(f"{letter}. {text}", self.pda_option_map_rev[letter])
+                                     for letter, text in q["options"].items()])
 
     def check_answer(self):
         if self.selected_option.get() == -1:
-            messagebox.showwarning("INPUT REQUIRED", "Please select response vector.")
+            _messagebox().showwarning("INPUT REQUIRED", "Please select response vector.")
             return
 
-        q = self.current_quiz_questions[self.current_question_idx]
-        is_correct = self.selected_option.get() == q["correct"]
-
-        if is_correct:
-            self.quiz_score += 1
-            feedback = f"POSITIVE RESPONSE CONFIRMED ✓\n\n{q['explanation']}"
-            color = COLOR_CORRECT
-        else:
-            feedback = f"NEGATIVE MATCH\nCorrect vector: {q['options'][q['correct']]}\n\n{q['explanation']}"
-            color = COLOR_WRONG
-
-        for widget in self.quiz_container.winfo_children():
-            widget.destroy()
-
-        tk.Label(self.quiz_container, text=feedback, font=FONT_NORMAL,
-                 fg=color, bg=COLOR_PANEL, wraplength=620, justify="left").pack(pady=15)
-
-        tk.Button(self.quiz_container, text="NEXT CYCLE", font=FONT_BUTTON,
-                  bg=COLOR_BUTTON_BG, fg=COLOR_ACCENT, activebackground=COLOR_BUTTON_HL,
-                  relief="flat", bd=1, width=25,
-                  command=self.next_question).pack(pady=20)
+        try:
+            feedback = self.quiz_session.check(self.selected_option.get())
+        except SESSION_ERRORS as e:
+            self._abort_session(self.quiz_view, self.quiz_controls_frame, e)
+            return
+        self.quiz_view.show_feedback(feedback.message, COLOR_CORRECT if feedback.is_correct else COLOR_WRONG)
 
     def check_pda_answer(self):
         if self.selected_pda_option.get() == -1:
-            messagebox.showwarning("INPUT REQUIRED", "Please select response vector.")
+            _messagebox().showwarning("INPUT REQUIRED", "Please select response vector.")
             return
 
-        q = self.current_pda_questions[self.current_pda_question_idx]
         selected_letter = self.pda_option_map_fwd[self.selected_pda_option.get()]
-        is_correct = (selected_letter == q["correct"])
-
-        if is_correct:
-            self.pda_score += 1
-            feedback = f"POSITIVE RESPONSE CONFIRMED ✓\n\nCorrect choice: {selected_letter}. {q['options'][q['correct']]}"
-            color = COLOR_CORRECT
-        else:
-            feedback = f"NEGATIVE MATCH\nCorrect choice: {q['correct']}. {q['options'][q['correct']]}"
-            color = COLOR_WRONG
-
-        for widget in self.pda_container.winfo_children():
-            widget.destroy()
-
-        tk.Label(self.pda_container, text=feedback, font=FONT_NORMAL,
-                 fg=color, bg=COLOR_PANEL, wraplength=620, justify="left").pack(pady=15)
-
-        tk.Button(self.pda_container, text="NEXT PDA CYCLE", font=FONT_BUTTON,
-                  bg=COLOR_BUTTON_BG, fg=COLOR_ACCENT, activebackground=COLOR_BUTTON_HL,
-                  relief="flat", bd=1, width=25,
-                  command=self.next_pda_question).pack(pady=20)
+        try:
+            feedback = self.pda_session.check(selected_letter)
+        except SESSION_ERRORS as e:
+            self._abort_session(self.pda_view, self.pda_controls_frame, e)
+            return
+        self.pda_view.show_feedback(feedback.message, COLOR_CORRECT if feedback.is_correct else COLOR_WRONG)
 
     def next_question(self):
-        self.current_question_idx += 1
+        try:
+            self.quiz_session.advance()
+        except SESSION_ERRORS as e:
+            self._abort_session(self.quiz_view, self.quiz_controls_frame, e)
+            return
         self.selected_option.set(-1)
         self.show_question()
 
     def next_pda_question(self):
-        self.current_pda_question_idx += 1
+        try:
+            self.pda_session.advance()
+        except SESSION_ERRORS as e:
+            self._abort_session(self.pda_view, self.pda_controls_frame, e)
+            return
         self.selected_pda_option.set(-1)
         self.show_pda_question()
 
-    def show_quiz_results(self):
-        # Check if current_quiz_questions is empty to avoid division by zero
-        if not self.current_quiz_questions:
-            percent = 0
-            num_answered = 0
-            total_questions_in_quiz = 0
-        else:
-            total_questions_in_quiz = len(self.current_quiz_questions)
-            num_answered = self.quiz_score
-            percent = (num_answered / total_questions_in_quiz) * 100
+    def _abort_session(self, view, controls_frame, error):
+        """End a session that cannot continue and give the start controls back."""
+        _messagebox().showerror("Evaluation Aborted", str(error))
+        view.show_result(f"EVALUATION ABORTED\n\n{error}")
+        controls_frame.pack(pady=(30, 0), padx=20, fill="x")
+        self.status_var.set("EVALUATION ABORTED")
 
-        msg = f"EVALUATION COMPLETE\n\nSCORE: {num_answered}/{total_questions_in_quiz}  ({percent:.1f}%)\n\n"
-
-        if percent >= 85:
-            msg += "EXCELLENT PROTOCOL MASTERY — Subject shows high social calibration"
-        elif percent >= 60:
-            msg += "ACCEPTABLE PERFORMANCE — Further training recommended"
-        else:
-            msg += "SIGNIFICANT RECALIBRATION REQUIRED"
-
-        for widget in self.quiz_container.winfo_children():
-            widget.destroy()
-
-        tk.Label(self.quiz_container, text=msg, font=("Consolas", 14, "bold"),
-                 fg=COLOR_ACCENT, bg=COLOR_PANEL, wraplength=620).pack(pady=40)
+    def show_quiz_results(self):
+        result = self.quiz_session.result()
+        self.quiz_view.show_result(result.message)
 
-        tk.Button(self.quiz_container, text="RE-INITIALIZE EVALUATION", font=FONT_BUTTON,
-                  bg=COLOR_BUTTON_BG, fg=COLOR_ACCENT, activebackground=COLOR_BUTTON_HL,
-                  relief="flat", bd=1, width=30,
-                  command=self.start_quiz).pack(pady=10)
-        
         # Repack the quiz controls frame and update the start button text after quiz
         self.quiz_controls_frame.pack(pady=(30, 0), padx=20, fill="x")
         self.start_quiz_button.config(text=f"INITIATE BEHAVIORAL EVALUATION ({len(self.quiz_questions)} CYCLES)")
 
-        self.status_var.set(f"EVALUATION RESULT: {self.quiz_score}/{total_questions_in_quiz}")
-    
-    def show_pda_results(self):
-        # PDA quiz always has 20 questions
-        total_pda_questions = len(self.current_pda_questions)
-        pda_score_percent = (self.pda_score / total_pda_questions) * 100
-
-        pda_msg = f"PDA EVALUATION COMPLETE\n\nSCORE: {self.pda_score}/{total_pda_questions}  ({pda_score_percent:.1f}%)\n\n"
-        
-        recommendation = ""
-        if pda_score_percent >= 80: # Higher threshold for PDA to indicate strong readiness
-            recommendation = "RECOMMENDATION: You exhibit strong indicators of relationship readiness. Your self-awareness and emotional regulation are commendable."
-        elif pda_score_percent >= 60:
-            recommendation = "RECOMMENDATION: You show potential for a healthy relationship, but some areas for self-reflection and growth are present. Consider working on emotional resilience."
-        else:
-            recommendation = "RECOMMENDATION: Significant self-reflection and growth are recommended before pursuing a serious relationship. Focus on understanding your patterns and needs."
-
-        pda_msg += recommendation
+        self.status_var.set(f"EVALUATION RESULT: {result.score}/{result.total}")
 
-        for widget in self.pda_container.winfo_children():
-            widget.destroy()
-
-        tk.Label(self.pda_container, text=pda_msg, font=("Consolas", 14, "bold"),
-                 fg=COLOR_ACCENT, bg=COLOR_PANEL, wraplength=620).pack(pady=40)
+    def show_pda_results(self):
+        result = self.pda_session.result()
+        self.pda_view.show_result(result.message)
 
-        tk.Button(self.pda_container, text="RE-INITIALIZE PDA EVALUATION", font=FONT_BUTTON,
-                  bg=COLOR_BUTTON_BG, fg=COLOR_ACCENT, activebackground=COLOR_BUTTON_HL,
-                  relief="flat", bd=1, width=30,
-                  command=self.start_pda_quiz).pack(pady=10)
-        
         self.pda_controls_frame.pack(pady=(30, 0), padx=20, fill="x")
-        self.start_pda_quiz_button.config(text=f"INITIATE PDA EVALUATION (20 CYCLES)") # Ensure text is correct
+        self._update_pda_button() # Ensure text is correct
 
-        self.status_var.set(f"PDA RESULT: {self.pda_score}/{total_pda_questions}")
+        self.status_var.set(f"PDA RESULT: {result.score}/{result.total}")
 
 # ────────────────────────────────────────────────
 if __name__ == "__main__":
+    started = time.perf_counter()
+    profiler = None
+    if os.environ.get("AURA_PROFILE"):
+        from profiling import Profiler
+        profiler = Profiler.from_env()
+    remote = None
+    if os.environ.get("AURA_SERVER"):  # e.g. AURA_SERVER=http://kiosk-hub:8765
+        from remote import RemoteClient
+        remote = RemoteClient(os.environ["AURA_SERVER"])
     root = tk.Tk()
-    app = AttentionApp(root)
-    root.mainloop()
\ No newline at end of file
+    app = AttentionApp(root, started, profiler, remote=remote)
+    root.mainloop()
+    if remote is not None:
+        remote.close()
+    else:
+        app.response_log.close()  # flush any buffered responses
+    if profiler is not None:
+        profiler.close()  # writes the JSON export
\ No newline at end of file
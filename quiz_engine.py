@@ -0,0 +1,225 @@
+# Attention Dynamics - Headless Quiz Engine
+# Session logic for EVALUATION and PDA runs, kept free of any UI so a single
+# process can hold many live sessions against one shared question bank.
+
+import json
+import random
+from collections import namedtuple
+
+from response_log import KIND_PDA, KIND_QUIZ
+
+
+class BankLoadError(Exception):
+    """Raised when a question bank file is missing or cannot be decoded."""
+
+
+# Helper function to load data from JSON files
+def read_json(filepath):
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        raise BankLoadError(f"Data file not found: {filepath}") from None
+    except json.JSONDecodeError:
+        raise BankLoadError(f"Error decoding JSON from: {filepath}") from None
+
+
+# ────────────────────────────────────────────────
+#                   SCORING RULES
+# ────────────────────────────────────────────────
+PDA_OPTION_MAP_REV = {'A': 0, 'B': 1, 'C': 2, 'D': 3}  # letter -> radiobutton value
+PDA_OPTION_MAP_FWD = {0: 'A', 1: 'B', 2: 'C', 3: 'D'}  # radiobutton value -> letter
+PDA_SESSION_LENGTH = 20                                 # PDA quiz always has 20 questions
+
+# Result band cutoffs in percent, highest band first
+QUIZ_BANDS = (85, 60)
+PDA_BANDS = (80, 60)  # Higher threshold for PDA to indicate strong readiness
+
+Feedback = namedtuple("Feedback", "is_correct message")
+Result = namedtuple("Result", "score total percent message")
+
+
+def quiz_band(percent):
+    if percent >= QUIZ_BANDS[0]:
+        return "EXCELLENT PROTOCOL MASTERY — Subject shows high social calibration"
+    elif percent >= QUIZ_BANDS[1]:
+        return "ACCEPTABLE PERFORMANCE — Further training recommended"
+    return "SIGNIFICANT RECALIBRATION REQUIRED"
+
+
+def pda_band(percent):
+    if percent >= PDA_BANDS[0]:
+        return "RECOMMENDATION: You exhibit strong indicators of relationship readiness. Your self-awareness and emotional regulation are commendable."
+    elif percent >= PDA_BANDS[1]:
+        return "RECOMMENDATION: You show potential for a healthy relationship, but some areas for self-reflection and growth are present. Consider working on emotional resilience."
+    return "RECOMMENDATION: Significant self-reflection and growth are recommended before pursuing a serious relationship. Focus on understanding your patterns and needs."
+
+
+def grade_quiz(q, choice):
+    """Grade an EVALUATION answer given as an option index."""
+    is_correct = choice == q["correct"]
+    if is_correct:
+        return Feedback(True, f"POSITIVE RESPONSE CONFIRMED ✓\n\n{q['explanation']}")
+    return Feedback(False, f"NEGATIVE MATCH\nCorrect vector: {q['options'][q['correct']]}\n\n{q['explanation']}")
+
+
+def grade_pda(q, letter):
+    """Grade a PDA answer given as an option letter ('A'-'D')."""
+    is_correct = letter == q["correct"]
+    if is_correct:
+        return Feedback(True, f"POSITIVE RESPONSE CONFIRMED ✓\n\nCorrect choice: {letter}. {q['options'][q['correct']]}")
+    return Feedback(False, f"NEGATIVE MATCH\nCorrect choice: {q['correct']}. {q['options'][q['correct']]}")
+
+
+def quiz_result(score, total):
+    # Guard against an empty session to avoid division by zero
+    percent = (score / total) * 100 if total else 0
+    msg = f"EVALUATION COMPLETE\n\nSCORE: {score}/{total}  ({percent:.1f}%)\n\n" + quiz_band(percent)
+    return Result(score, total, percent, msg)
+
+
+def pda_result(score, total):
+    percent = (score / total) * 100 if total else 0
+    msg = f"PDA EVALUATION COMPLETE\n\nSCORE: {score}/{total}  ({percent:.1f}%)\n\n" + pda_band(percent)
+    return Result(score, total, percent, msg)
+
+
+# ────────────────────────────────────────────────
+#                   QUESTION BANK
+# ────────────────────────────────────────────────
+class QuestionBank:
+    """Read-only, shared sequence of question records.
+
+    ``records`` may be a list of dicts or any sequence that decodes records
+    on ``__getitem__``. Sessions only ever store indexes into the bank.
+    """
+
+    __slots__ = ("_records",)
+
+    def __init__(self, records):
+        self._records = tuple(records) if isinstance(records, list) else records
+
+    def __len__(self):
+        return len(self._records)
+
+    def __getitem__(self, idx):
+        return self._records[idx]
+
+    def __iter__(self):
+        return iter(self._records)
+
+
+# ────────────────────────────────────────────────
+#                   SESSIONS
+# ────────────────────────────────────────────────
+class _Session:
+    """One run through a sampled slice of a bank.
+
+    Holds only a reference to the bank, the sampled indexes and a few
+    counters, so tens of thousands can live in one process. When a shared
+    sampler or response log is given, every graded answer is reported to it.
+    """
+
+    __slots__ = ("bank", "order", "position", "score", "answered", "sampler", "log", "session_id")
+    KIND = None
+
+    def __init__(self, bank, order, sampler=None, log=None):
+        self.bank = bank
+        self.order = tuple(order)
+        self.sampler = sampler
+        self.log = log
+        self.session_id = log.next_session_id() if log is not None else 0
+        self.position = 0
+        self.score = 0
+        self.answered = False
+
+    def __len__(self):
+        return len(self.order)
+
+    @property
+    def finished(self):
+        return self.position >= len(self.order)
+
+    @property
+    def current_index(self):
+        return self.order[self.position]
+
+    def current(self):
+        return self.bank[self.order[self.position]]
+
+    def check(self, choice):
+        if self.finished:
+            raise RuntimeError("session is already complete")
+        if self.answered:
+            raise RuntimeError("current question was already answered")
+        feedback = self._grade(self.current(), choice)
+        if feedback.is_correct:
+            self.score += 1
+        if self.sampler is not None:
+            self.sampler.record(self.current_index, feedback.is_correct)
+        if self.log is not None:
+            self.log.append(self.KIND, self.session_id, self.current_index,
+                            self._choice_code(choice), feedback.is_correct)
+        self.answered = True
+        return feedback
+
+    def advance(self):
+        self.position += 1
+        self.answered = False
+        return not self.finished
+
+    @staticmethod
+    def _draw(bank, count, rng, sampler):
+        if sampler is not None:
+            return sampler.sample(count)
+        return rng.sample(range(len(bank)), count)
+
+    def _grade(self, q, choice):
+        raise NotImplementedError
+
+    def _choice_code(self, choice):
+        return choice
+
+    def result(self):
+        raise NotImplementedError
+
+
+class QuizSession(_Session):
+    __slots__ = ()
+    KIND = KIND_QUIZ
+
+    @classmethod
+    def start(cls, bank, count, rng=random, sampler=None, log=None):
+        if not (1 <= count <= len(bank)):
+            raise ValueError(f"Please select a number between 1 and {len(bank)}.")
+        return cls(bank, cls._draw(bank, count, rng, sampler), sampler, log)
+
+    def _grade(self, q, choice):
+        if choice is None or choice == -1:
+            raise ValueError("Please select response vector.")
+        return grade_quiz(q, choice)
+
+    def result(self):
+        return quiz_result(self.score, len(self.order))
+
+
+class PdaSession(_Session):
+    __slots__ = ()
+    KIND = KIND_PDA
+
+    @classmethod
+    def start(cls, bank, count=PDA_SESSION_LENGTH, rng=random, sampler=None, log=None):
+        if len(bank) < count:
+            raise ValueError(f"Not enough PDA questions available (need {count}).")
+        return cls(bank, cls._draw(bank, count, rng, sampler), sampler, log)
+
+    def _grade(self, q, letter):
+        if letter not in PDA_OPTION_MAP_REV:
+            raise ValueError("Please select response vector.")
+        return grade_pda(q, letter)
+
+    def _choice_code(self, letter):
+        return PDA_OPTION_MAP_REV[letter]
+
+    def result(self):
+        return pda_result(self.score, len(self.order))
@@ -0,0 +1,131 @@
+# Attention Dynamics - Remote Session Client
+# Lets AttentionApp run as a thin terminal against server.py. Remote
+# sessions expose the same interface as QuizSession / PdaSession, but the
+# questions, grading and result bands all come from the server.
+
+import http.client
+import json
+import threading
+import urllib.parse
+
+from quiz_engine import Feedback, Result
+
+TIMEOUT = 5.0
+
+
+class RemoteClient:
+    """One kept-alive HTTP connection to a quiz server, shared by the app's threads."""
+
+    def __init__(self, url, timeout=TIMEOUT):
+        parts = urllib.parse.urlsplit(url if "//" in url else "http://" + url)
+        self.url = url
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def request(self, method, path, payload=None):
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        with self._lock:
+            for attempt in (0, 1):
+                if self._conn is None:
+                    self._conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+                try:
+                    self._conn.request(method, path, body, headers)
+                    response = self._conn.getresponse()
+                    data = json.loads(response.read() or b"{}")
+                    break
+                except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                    # The server closed an idle kept-alive connection; reconnect once
+                    self._conn.close()
+                    self._conn = None
+                    if attempt:
+                        raise ConnectionError(f"Lost connection to quiz server {self.url}") from None
+                except http.client.HTTPException as e:
+                    self._conn.close()
+                    self._conn = None
+                    raise ConnectionError(f"Bad response from quiz server {self.url}: {e}") from None
+                except OSError:
+                    # Timed out or refused: the connection may be mid-response, so never reuse it
+                    self._conn.close()
+                    self._conn = None
+                    raise
+        if response.status >= 400:
+            raise ValueError(data.get("error", f"Quiz server error {response.status}"))
+        return data
+
+    def bank_sizes(self):
+        return self.request("GET", "/banks")
+
+    def tips(self):
+        return self.request("GET", "/tips")
+
+    def start(self, kind, count=None, adaptive=False):
+        payload = {"kind": kind, "count": count} if kind == "quiz" else {"kind": kind, "adaptive": adaptive}
+        return RemoteSession(self, self.request("POST", "/sessions", payload))
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class RemoteBank:
+    """Stands in for a bank that lives on the server; only its size is known here."""
+
+    __slots__ = ("size",)
+
+    def __init__(self, size):
+        self.size = size
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, idx):
+        raise IndexError("questions are served by the quiz server")
+
+
+class RemoteSession:
+    """Client side of one server session, mirroring the engine's session API."""
+
+    def __init__(self, client, state):
+        self.client = client
+        self.token = state["session"]
+        self.answered = False
+        self._apply(state)
+
+    def _apply(self, state):
+        self.position = state["position"]
+        self.score = state["score"]
+        self.finished = state["finished"]
+        self._total = state["total"]
+        self._question = state.get("question")
+        self._result = state.get("result")
+        if "max_items" in state:  # adaptive PDA
+            self.max_items = state["max_items"]
+
+    def __len__(self):
+        return self._total
+
+    @property
+    def current_index(self):
+        return self._question["index"]
+
+    def current(self):
+        return self._question
+
+    def check(self, choice):
+        data = self.client.request("POST", f"/sessions/{self.token}/answer", {"choice": choice})
+        self.answered = True
+        return Feedback(data["is_correct"], data["message"])
+
+    def advance(self):
+        self._apply(self.client.request("POST", f"/sessions/{self.token}/next"))
+        self.answered = False
+        return not self.finished
+
+    def result(self):
+        return Result(**self._result)
@@ -0,0 +1,122 @@
+# Attention Dynamics - Response Log
+# Append-only binary log of every graded answer. Records are buffered and
+# written in batches by a background thread so the Tk loop never waits on
+# disk, while per-question aggregates are kept up to date in memory.
+
+import os
+import struct
+import threading
+import time
+from collections import namedtuple
+
+KIND_QUIZ = 0
+KIND_PDA = 1
+
+# timestamp, session id, question index, kind, choice, correct
+RECORD = struct.Struct("<dIIBBB")
+BATCH_SIZE = 256
+FLUSH_INTERVAL = 1.0  # seconds a partial batch may sit in memory
+
+LogRecord = namedtuple("LogRecord", "timestamp session_id question kind choice is_correct")
+ItemStats = namedtuple("ItemStats", "attempts correct correct_rate choices")
+
+
+def read_records(path):
+    """Yield every complete record in a response log file."""
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(RECORD.size * 4096)
+            usable = len(chunk) - len(chunk) % RECORD.size  # ignore a torn tail
+            for rec in RECORD.iter_unpack(chunk[:usable]):
+                yield LogRecord._make(rec[:5] + (bool(rec[5]),))
+            if len(chunk) < RECORD.size * 4096:
+                return
+
+
+class ResponseLog:
+    """Batched writer plus O(1) per-question statistics."""
+
+    def __init__(self, path, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        # (kind, question) -> [attempts, correct, choice 0, choice 1, ...]
+        self._stats = {}
+        # (kind, question) -> correct answers in a row up to the latest one
+        self._streaks = {}
+        self._last_session = 0
+        self._writer = threading.Thread(target=self._run, name="response-log", daemon=True)
+        self._writer.start()
+
+    # ── Aggregates ──
+    def _count(self, kind, question, choice, is_correct):
+        row = self._stats.get((kind, question))
+        if row is None:
+            row = self._stats[(kind, question)] = [0, 0, 0, 0, 0, 0]  # A–D / options 0–3
+        row[0] += 1
+        row[1] += is_correct
+        if choice + 2 >= len(row):
+            row.extend([0] * (choice + 3 - len(row)))
+        row[choice + 2] += 1
+        self._streaks[(kind, question)] = self._streaks.get((kind, question), 0) + 1 if is_correct else 0
+
+    def replay(self):
+        """Seed the aggregates from records already on disk (run once at startup)."""
+        if not os.path.exists(self.path):
+            return 0
+        n = 0
+        for rec in read_records(self.path):
+            self._count(rec.kind, rec.question, rec.choice, rec.is_correct)
+            self._last_session = max(self._last_session, rec.session_id)
+            n += 1
+        return n
+
+    def stats(self, kind, question):
+        row = self._stats.get((kind, question))
+        if row is None:
+            return ItemStats(0, 0, 0.0, (0, 0, 0, 0))
+        return ItemStats(row[0], row[1], row[1] / row[0], tuple(row[2:]))
+
+    def streak(self, kind, question):
+        """Correct answers in a row up to the latest answer to ``question``."""
+        return self._streaks.get((kind, question), 0)
+
+    def next_session_id(self):
+        self._last_session += 1
+        return self._last_session
+
+    # ── Writing ──
+    def append(self, kind, session_id, question, choice, is_correct):
+        rec = RECORD.pack(time.time(), session_id, question, kind, choice, is_correct)
+        with self._lock:
+            self._pending.append(rec)
+            full = len(self._pending) >= self.batch_size
+        self._count(kind, question, choice, is_correct)
+        if full:
+            self._wake.set()
+
+    def _drain(self, f):
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if batch:
+            f.write(b"".join(batch))
+            f.flush()
+
+    def _run(self):
+        with open(self.path, "ab") as f:
+            while not self._closed:
+                self._wake.wait(self.flush_interval)
+                self._wake.clear()
+                self._drain(f)
+            self._drain(f)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._writer.join()
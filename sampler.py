@@ -0,0 +1,129 @@
+# Attention Dynamics - Weighted Question Sampler
+# Spaced-repetition selection over a question bank. Per-question weights live
+# in a Fenwick (binary indexed) tree, so drawing k distinct questions and
+# updating a weight are both O(log n) even on banks of a million questions.
+
+import random
+
+# Leitner-style boxes: a correct answer moves a question up one box, a wrong
+# answer sends it back to box 0. Weights are integers so prefix sums are exact.
+MAX_BOX = 5
+BOX_WEIGHTS = tuple(2 ** (MAX_BOX - box) for box in range(MAX_BOX + 1))
+
+
+class FenwickTree:
+    """Prefix sums over non-negative integer weights with point updates."""
+
+    __slots__ = ("n", "tree", "_top")
+
+    def __init__(self, weights):
+        self.n = len(weights)
+        tree = [0] + list(weights)
+        for i in range(1, self.n + 1):  # O(n) build
+            parent = i + (i & -i)
+            if parent <= self.n:
+                tree[parent] += tree[i]
+        self.tree = tree
+        self._top = 1 << (self.n.bit_length() - 1) if self.n else 0
+
+    def add(self, idx, delta):
+        i = idx + 1
+        tree, n = self.tree, self.n
+        while i <= n:
+            tree[i] += delta
+            i += i & -i
+
+    def prefix(self, idx):
+        """Sum of weights[0:idx]."""
+        total, tree = 0, self.tree
+        while idx > 0:
+            total += tree[idx]
+            idx -= idx & -idx
+        return total
+
+    def total(self):
+        return self.prefix(self.n)
+
+    def find(self, target):
+        """Smallest index whose inclusive prefix sum exceeds ``target``."""
+        pos, tree, step = 0, self.tree, self._top
+        while step:
+            nxt = pos + step
+            if nxt <= self.n and tree[nxt] <= target:
+                pos = nxt
+                target -= tree[nxt]
+            step >>= 1
+        return pos
+
+
+class WeightedSampler:
+    """Draws distinct question indexes biased toward questions not yet mastered.
+
+    Pass ``seed`` for a deterministic, reproducible draw sequence. Questions
+    grouped with ``set_clusters`` (e.g. near-duplicates found by dedupe.py)
+    are never drawn together in one sample.
+    """
+
+    def __init__(self, n, seed=None):
+        self.rng = random.Random(seed)
+        self.boxes = bytearray(n)
+        self.weights = [BOX_WEIGHTS[0]] * n
+        self.tree = FenwickTree(self.weights)
+        self.cluster_of = {}  # index -> tuple of every index in its cluster
+
+    def __len__(self):
+        return len(self.weights)
+
+    def weight(self, idx):
+        return self.weights[idx]
+
+    def set_weight(self, idx, weight):
+        if weight < 0:
+            raise ValueError("weights must be non-negative")
+        self.tree.add(idx, weight - self.weights[idx])
+        self.weights[idx] = weight
+
+    def set_boxes(self, boxes):
+        """Start from known boxes (e.g. rebuilt from the response log) in O(n)."""
+        boxes = bytearray(min(box, MAX_BOX) for box in boxes)
+        if len(boxes) != len(self.weights):
+            raise ValueError(f"Expected {len(self.weights)} boxes, got {len(boxes)}")
+        self.boxes = boxes
+        self.weights = [BOX_WEIGHTS[box] for box in boxes]
+        self.tree = FenwickTree(self.weights)
+
+    def set_clusters(self, groups):
+        self.cluster_of = {}
+        for group in groups:
+            group = tuple(group)
+            for idx in group:
+                self.cluster_of[idx] = group
+
+    def record(self, idx, is_correct):
+        """Move a question between boxes after it was answered."""
+        box = min(self.boxes[idx] + 1, MAX_BOX) if is_correct else 0
+        self.boxes[idx] = box
+        self.set_weight(idx, BOX_WEIGHTS[box])
+
+    def sample(self, k):
+        """Return ``k`` distinct indexes, each drawn proportionally to its weight."""
+        if not 0 <= k <= len(self.weights):
+            raise ValueError(f"Cannot draw {k} questions from a bank of {len(self.weights)}")
+        tree, rng = self.tree, self.rng
+        drawn, excluded = [], set()
+        try:
+            for _ in range(k):
+                total = tree.total()
+                if total <= 0:
+                    raise ValueError(f"Only {len(drawn)} distinct questions can be drawn")
+                idx = tree.find(rng.randrange(total))
+                drawn.append(idx)
+                # Exclude it, and its cluster, until the draw is complete
+                for member in self.cluster_of.get(idx, (idx,)):
+                    if member not in excluded:
+                        excluded.add(member)
+                        tree.add(member, -self.weights[member])
+        finally:
+            for idx in excluded:
+                tree.add(idx, self.weights[idx])
+        return drawn
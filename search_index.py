@@ -0,0 +1,155 @@
+# Attention Dynamics - Protocol Search Index
+# Tokenized inverted index over the tips bank with BM25 ranking and prefix
+# matching on the last query word, for as-you-type search. The index can be
+# saved beside tips.json and is reused while the source file is unchanged.
+
+import bisect
+import heapq
+import json
+import math
+import os
+import re
+
+SUFFIX = ".idx"
+VERSION = 1
+
+# Title hits count for more than hits in the body text
+FIELD_WEIGHTS = (("title", 3), ("description", 1), ("education", 1))
+K1 = 1.2
+B = 0.75
+MAX_EXPANSIONS = 32  # prefix terms considered for the word being typed
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    return _TOKEN.findall(text.lower())
+
+
+def index_path(json_path):
+    return os.path.splitext(json_path)[0] + SUFFIX
+
+
+def _source_stamp(path):
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+class SearchIndex:
+    def __init__(self):
+        self.postings = {}   # term -> {doc id: weighted term frequency}
+        self.terms = []      # sorted vocabulary, for prefix lookup
+        self.doc_len = []
+        self.total_len = 0
+        self._norms = None   # per-document BM25 length norms, rebuilt after adds
+
+    def __len__(self):
+        return len(self.doc_len)
+
+    @classmethod
+    def build(cls, docs):
+        index = cls()
+        for doc in docs:
+            index.add(doc, _sort=False)
+        index.terms = sorted(index.postings)
+        return index
+
+    def add(self, doc, _sort=True):
+        """Index one more tip; returns its doc id."""
+        doc_id = len(self.doc_len)
+        length = 0
+        for field, weight in FIELD_WEIGHTS:
+            for term in tokenize(doc.get(field, "")):
+                postings = self.postings.get(term)
+                if postings is None:
+                    postings = self.postings[term] = {}
+                    if _sort:
+                        bisect.insort(self.terms, term)
+                postings[doc_id] = postings.get(doc_id, 0) + weight
+                length += weight
+        self.doc_len.append(length)
+        self.total_len += length
+        self._norms = None
+        return doc_id
+
+    def _expand(self, prefix):
+        lo = bisect.bisect_left(self.terms, prefix)
+        hi = bisect.bisect_left(self.terms, prefix + "\uffff", lo)
+        return self.terms[lo:min(hi, lo + MAX_EXPANSIONS)]
+
+    def _doc_norms(self):
+        if self._norms is None:
+            avg = self.total_len / len(self.doc_len) or 1.0
+            self._norms = [K1 * (1 - B + B * length / avg) for length in self.doc_len]
+        return self._norms
+
+    def _bm25(self, postings, scores):
+        n = len(self.doc_len)
+        idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5)) * (K1 + 1)
+        norms, get = self._doc_norms(), scores.get
+        for doc_id, tf in postings.items():
+            score = idf * tf / (tf + norms[doc_id])
+            if score > get(doc_id, 0.0):
+                scores[doc_id] = score
+
+    def search(self, query, limit=10):
+        """Return up to ``limit`` (doc id, score) pairs, best first.
+
+        Every word but the last must match a term exactly; the last word is
+        treated as a prefix, since it is usually still being typed.
+        """
+        words = tokenize(query)
+        if not words or not self.doc_len:
+            return []
+        totals = {}
+        for i, word in enumerate(words):
+            terms = self._expand(word) if i == len(words) - 1 else [word]
+            scores = {}  # best expansion per document for this word
+            for term in terms:
+                postings = self.postings.get(term)
+                if postings:
+                    self._bm25(postings, scores)
+            for doc_id, score in scores.items():
+                totals[doc_id] = totals.get(doc_id, 0.0) + score
+        return heapq.nlargest(limit, totals.items(), key=lambda item: item[1])
+
+    # ── Persistence ──
+    def save(self, path, source_path):
+        data = {"version": VERSION, "source": _source_stamp(source_path),
+                "doc_len": self.doc_len,
+                "postings": {t: list(p.items()) for t, p in self.postings.items()}}
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, source_path):
+        """Load a saved index, or return None if it is missing or stale."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != VERSION or data.get("source") != _source_stamp(source_path):
+                return None
+        except (OSError, ValueError):
+            return None
+        index = cls()
+        index.doc_len = data["doc_len"]
+        index.total_len = sum(index.doc_len)
+        index.postings = {t: dict(p) for t, p in data["postings"].items()}
+        index.terms = sorted(index.postings)
+        return index
+
+
+def load_or_build(json_path, docs, persist=True):
+    """Reuse the saved index for ``json_path`` if current, else build (and save) one."""
+    path = index_path(json_path)
+    index = SearchIndex.load(path, json_path) if os.path.exists(json_path) else None
+    if index is None or len(index) != len(docs):
+        index = SearchIndex.build(docs)
+        if persist and os.path.exists(json_path):
+            try:
+                index.save(path, json_path)
+            except OSError:
+                pass  # read-only install; the in-memory index still works
+    return index
@@ -0,0 +1,323 @@
+# Attention Dynamics - Quiz Server
+# One asyncio process that holds the banks once and serves question
+# delivery, answer checking and result banding to many thin clients over a
+# small JSON-over-HTTP/1.1 API (stdlib only, keep-alive supported). Sessions
+# are the same engine objects the tabs use, so scoring is identical; idle
+# sessions expire.
+#
+#   GET    /banks                    item counts per bank
+#   GET    /tips                     every protocol tip
+#   POST   /sessions                 {"kind": "quiz", "count": 10} | {"kind": "pda", "adaptive": false}
+#   GET    /sessions/<id>            current question
+#   POST   /sessions/<id>/answer     {"choice": 2} (quiz) | {"choice": "C"} (pda)
+#   POST   /sessions/<id>/next       next question, or the result once finished
+#   DELETE /sessions/<id>
+#   GET    /stats
+#
+# Usage: python server.py --host 0.0.0.0 --port 8765
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import secrets
+import sys
+import time
+
+from content_pack import ContentPack
+from qbank import load_records
+from quiz_engine import BankLoadError, PdaSession, QuestionBank, QuizSession
+from response_log import KIND_PDA, KIND_QUIZ, ResponseLog
+from sampler import WeightedSampler
+
+BANK_FILES = {"tips": "tips.json", "quiz": "quiz_questions.json", "pda": "PDA.json"}
+LOG_KINDS = {"quiz": KIND_QUIZ, "pda": KIND_PDA}
+RESPONSE_LOG = "responses.log"
+DEDUPE_INDEX = "banks.lsh"
+HOST = "127.0.0.1"
+PORT = 8765
+IDLE_TIMEOUT = 600.0        # seconds without a request before a session is dropped
+MAX_SESSIONS = 100_000
+MAX_BODY = 64 * 1024
+INDEX_REFRESH = 60.0        # seconds an adaptive item index is reused
+
+_SESSION_PATH = re.compile(r"^/sessions/([0-9a-f]+)(?:/(answer|next))?$")
+_REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+            405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large",
+            500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def load_banks(bank_files=BANK_FILES):
+    """Bank records by key, from the content pack when there is one."""
+    pack = ContentPack() if ContentPack.exists() else None
+    return {key: pack.bank(key) if pack is not None else load_records(path)
+            for key, path in bank_files.items()}
+
+
+# ────────────────────────────────────────────────
+#                   SESSION STORE
+# ────────────────────────────────────────────────
+class QuizServer:
+    """Sessions keyed by random token, over banks shared by every client."""
+
+    def __init__(self, banks, log=None, idle_timeout=IDLE_TIMEOUT, groups=None):
+        self.tips = list(banks["tips"])  # served whole by GET /tips
+        self.banks = {"quiz": QuestionBank(banks["quiz"]), "pda": QuestionBank(banks["pda"])}
+        self.samplers = {}
+        for kind, bank in self.banks.items():
+            self.samplers[kind] = WeightedSampler(len(bank))
+            if log is not None:  # Leitner boxes pick up where the logged answers left off
+                self.samplers[kind].set_boxes(log.streak(LOG_KINDS[kind], idx) for idx in range(len(bank)))
+            self.samplers[kind].set_clusters((groups or {}).get(kind, ()))
+        self.log = log
+        self.idle_timeout = idle_timeout
+        self.sessions = {}      # token -> [session, last seen]
+        self.requests = 0
+        self.expired = 0
+        self._index = None      # (built at, ItemInformationIndex) for adaptive PDA
+
+    # ── Payloads ──
+    @staticmethod
+    def _state(session):
+        state = {"position": session.position, "total": len(session),
+                 "finished": session.finished, "score": session.score}
+        if hasattr(session, "max_items"):
+            state["max_items"] = session.max_items
+        if session.finished:
+            result = session.result()
+            state["result"] = {"score": result.score, "total": result.total,
+                               "percent": result.percent, "message": result.message}
+        else:
+            q = session.current()  # answers and explanations never leave the server
+            state["question"] = {"index": session.current_index, "question": q["question"],
+                                 "options": q["options"]}
+        return state
+
+    # ── Operations ──
+    def create(self, body):
+        if len(self.sessions) >= MAX_SESSIONS:
+            raise HttpError(503, "Too many live sessions")
+        kind = body.get("kind")
+        if not isinstance(kind, str) or kind not in self.banks:
+            raise HttpError(400, f"unknown session kind: {kind!r}")
+        bank, sampler = self.banks[kind], self.samplers[kind]
+        try:
+            if kind == "quiz":
+                session = QuizSession.start(bank, int(body.get("count", 0)), sampler=sampler, log=self.log)
+            elif body.get("adaptive"):
+                from adaptive import AdaptivePdaSession
+                session = AdaptivePdaSession.start(bank, self._item_index(), sampler=sampler, log=self.log)
+            else:
+                session = PdaSession.start(bank, sampler=sampler, log=self.log)
+        except (TypeError, ValueError) as e:
+            raise HttpError(400, str(e)) from None
+        token = secrets.token_hex(16)
+        self.sessions[token] = [session, time.monotonic()]
+        return 201, dict(self._state(session), session=token)
+
+    def _item_index(self):
+        from adaptive import ItemInformationIndex
+        now = time.monotonic()
+        if self._index is None or now - self._index[0] > INDEX_REFRESH:
+            self._index = (now, ItemInformationIndex.from_log(len(self.banks["pda"]), self.log))
+        return self._index[1]
+
+    def _session(self, token):
+        entry = self.sessions.get(token)
+        if entry is None:
+            raise HttpError(404, "session not found or expired")
+        entry[1] = time.monotonic()
+        return entry[0]
+
+    def answer(self, token, body):
+        session = self._session(token)
+        choice = body.get("choice")
+        if not session.finished:
+            # The app's radiobuttons can only send a listed option; remote clients could send anything
+            if isinstance(session, QuizSession):
+                valid = type(choice) is int and 0 <= choice < len(session.current()["options"])
+            else:
+                valid = isinstance(choice, str)
+            if not valid:
+                raise HttpError(400, "Please select response vector.")
+        try:
+            feedback = session.check(choice)
+        except ValueError as e:
+            raise HttpError(400, str(e)) from None
+        except RuntimeError as e:
+            raise HttpError(409, str(e)) from None
+        return 200, {"is_correct": feedback.is_correct, "message": feedback.message}
+
+    def advance(self, token):
+        session = self._session(token)
+        if not session.answered and not session.finished:
+            raise HttpError(409, "current question has not been answered")
+        session.advance()
+        state = self._state(session)
+        if session.finished:
+            del self.sessions[token]  # the result is in this response
+        return 200, state
+
+    def expire(self, now=None):
+        now = time.monotonic() if now is None else now
+        stale = [token for token, (_, seen) in self.sessions.items() if now - seen > self.idle_timeout]
+        for token in stale:
+            del self.sessions[token]
+        self.expired += len(stale)
+        return len(stale)
+
+    def dispatch(self, method, path, body):
+        self.requests += 1
+        if path == "/banks" and method == "GET":
+            return 200, {"tips": len(self.tips), "quiz": len(self.banks["quiz"]),
+                         "pda": len(self.banks["pda"])}
+        if path == "/tips" and method == "GET":
+            return 200, self.tips
+        if path == "/stats" and method == "GET":
+            return 200, {"sessions": len(self.sessions), "requests": self.requests, "expired": self.expired}
+        if path == "/sessions":
+            if method != "POST":
+                raise HttpError(405, "use POST to start a session")
+            return self.create(body)
+        match = _SESSION_PATH.match(path)
+        if match is None:
+            raise HttpError(404, f"no such resource: {path}")
+        token, action = match.groups()
+        if action is None and method == "GET":
+            return 200, self._state(self._session(token))
+        if action is None and method == "DELETE":
+            self._session(token)
+            del self.sessions[token]
+            return 200, {}
+        if action == "answer" and method == "POST":
+            return self.answer(token, body)
+        if action == "next" and method == "POST":
+            return self.advance(token)
+        raise HttpError(405, f"{method} not allowed on {path}")
+
+
+# ────────────────────────────────────────────────
+#                   HTTP LAYER
+# ────────────────────────────────────────────────
+async def _read_request(reader):
+    line = await reader.readline()
+    if not line:
+        return None
+    method, target, version = line.decode("latin-1").split()
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length") or 0)
+    if length > MAX_BODY:
+        raise HttpError(413, "request body too large")
+    body = await reader.readexactly(length) if length else b""
+    keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+    return method, target.split("?", 1)[0], body, keep_alive
+
+
+def _response(status, payload, keep_alive):
+    data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    head = (f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + data
+
+
+async def serve(server, host=HOST, port=PORT, ready=None):
+    """Run until cancelled; ``ready`` is called with the bound (host, port)."""
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                    if request is None:
+                        break
+                    method, path, body, keep_alive = request
+                    body = json.loads(body) if body else {}
+                    if not isinstance(body, dict):
+                        raise HttpError(400, "request body must be a JSON object")
+                    # Engine calls take microseconds, so they run inline on the loop
+                    status, payload = server.dispatch(method, path, body)
+                except HttpError as e:
+                    status, payload, keep_alive = e.status, {"error": str(e)}, e.status != 413
+                except ValueError:  # malformed request line, headers or JSON
+                    status, payload, keep_alive = 400, {"error": "malformed request"}, False
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    raise
+                except Exception as e:  # a bug must not take the connection down without a reply
+                    print(f"error handling request: {e!r}", file=sys.stderr)
+                    status, payload, keep_alive = 500, {"error": "internal server error"}, False
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def reap():
+        while True:
+            await asyncio.sleep(min(30.0, server.idle_timeout / 4))
+            server.expire()
+
+    listener = await asyncio.start_server(handle, host, port)
+    reaper = asyncio.ensure_future(reap())
+    if ready is not None:
+        ready(listener.sockets[0].getsockname()[:2])
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        reaper.cancel()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve quiz and PDA sessions to remote terminals")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT, help="0 picks a free port")
+    parser.add_argument("--idle-timeout", type=float, default=IDLE_TIMEOUT)
+    parser.add_argument("--log", default=RESPONSE_LOG, help="response log ('%s' to discard)" % os.devnull)
+    args = parser.parse_args(argv)
+
+    log = None
+    try:
+        # Pack shards are parsed lazily, so a stale one can surface anywhere up to here
+        banks = load_banks()
+        groups = {}
+        if os.path.exists(DEDUPE_INDEX):
+            from dedupe import bank_clusters
+            groups = {kind: bank_clusters(kind, banks[kind], DEDUPE_INDEX) for kind in ("quiz", "pda")}
+        log = ResponseLog(args.log)
+        log.replay()
+        server = QuizServer(banks, log, args.idle_timeout, groups)
+    except BankLoadError as e:
+        if log is not None:
+            log.close()
+        sys.exit(str(e))
+
+    def ready(address):
+        print(f"listening on {address[0]}:{address[1]}", flush=True)
+    try:
+        asyncio.run(serve(server, args.host, args.port, ready))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        log.close()
+
+
+if __name__ == "__main__":
+    main()
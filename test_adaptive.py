@@ -0,0 +1,30 @@
+# Attention Dynamics - Adaptive PDA tests
+
+import random
+
+from adaptive import AdaptivePdaSession, ItemInformationIndex
+from quiz_engine import QuestionBank
+from sampler import WeightedSampler
+
+
+def test_best_skips_clusters_of_used_items():
+    index = ItemInformationIndex([0.0, 0.1, 0.2, 2.0, 3.0])
+    clusters = {0: (0, 1, 2), 1: (0, 1, 2), 2: (0, 1, 2)}
+    assert index.best(0.0, {0}, k=1) == 1
+    assert index.best(0.0, {0}, k=1, cluster_of=clusters) == 3
+
+
+def test_adaptive_session_asks_one_item_per_cluster():
+    bank = QuestionBank([{"question": f"Q{i}", "options": {"A": "yes", "B": "no"}, "correct": "A"}
+                         for i in range(30)])
+    index = ItemInformationIndex([0.0] * 30)
+    sampler = WeightedSampler(30, seed=0)
+    groups = [list(range(start, start + 3)) for start in range(0, 30, 3)]
+    sampler.set_clusters(groups)
+    session = AdaptivePdaSession.start(bank, index, rng=random.Random(1), sampler=sampler,
+                                       confidence=1.1)  # never decided early
+    while not session.finished:
+        session.check("A" if session.position % 2 else "B")
+        session.advance()
+    assert len(session.order) == len(groups)
+    assert len({idx // 3 for idx in session.order}) == len(groups)
@@ -0,0 +1,82 @@
+# Attention Dynamics - BackgroundRenderer tests
+# Runs against a fake canvas, so no display is needed.
+
+from quiz import BackgroundRenderer
+
+
+class FakeCanvas:
+    def __init__(self):
+        self.items = {}
+        self.created = 0
+        self.deleted = 0
+        self.scheduled = {}
+        self._next_id = 0
+
+    def after(self, ms, fn):
+        self._next_id += 1
+        self.scheduled[self._next_id] = fn
+        return self._next_id
+
+    def after_cancel(self, after_id):
+        del self.scheduled[after_id]
+
+    def create_line(self, *coords, **kw):
+        self._next_id += 1
+        self.items[self._next_id] = coords
+        self.created += 1
+        return self._next_id
+
+    def coords(self, item, *coords):
+        self.items[item] = coords
+
+    def delete(self, item):
+        del self.items[item]
+        self.deleted += 1
+
+    def run_pending(self):
+        pending, self.scheduled = self.scheduled, {}
+        for fn in pending.values():
+            fn()
+
+
+def test_resize_burst_redraws_once():
+    canvas = FakeCanvas()
+    renderer = BackgroundRenderer(canvas)
+    for width in range(400, 800, 10):
+        renderer.schedule(width, 600)
+    assert len(canvas.scheduled) == 1  # earlier timers were cancelled
+    canvas.run_pending()
+
+    assert renderer.redraw_count == 1
+    assert len(renderer.lines) == len(range(0, 790, BackgroundRenderer.SPACING))
+    assert canvas.created == len(renderer.lines)
+    assert canvas.deleted == 0
+
+
+def test_only_line_count_difference_is_created_or_deleted():
+    canvas = FakeCanvas()
+    renderer = BackgroundRenderer(canvas)
+    renderer.schedule(400, 300)
+    canvas.run_pending()
+    assert canvas.created == 10
+
+    renderer.schedule(600, 300)
+    canvas.run_pending()
+    assert (canvas.created, canvas.deleted) == (15, 0)
+
+    renderer.schedule(200, 300)
+    canvas.run_pending()
+    assert (canvas.created, canvas.deleted) == (15, 10)
+    assert len(canvas.items) == len(renderer.lines) == 5
+    assert canvas.items[renderer.lines[-1]] == (160, 0, 160 + 200 // 6, 300)
+    assert renderer.redraw_count == 3
+
+
+def test_unchanged_size_is_not_redrawn():
+    canvas = FakeCanvas()
+    renderer = BackgroundRenderer(canvas)
+    renderer.schedule(400, 300)
+    canvas.run_pending()
+    renderer.schedule(400, 300)
+    canvas.run_pending()
+    assert renderer.redraw_count == 1
@@ -0,0 +1,69 @@
+# Attention Dynamics - Content pack reload tests
+
+import json
+import os
+
+import pytest
+
+from content_pack import ContentPack, build_manifest
+from quiz import load_bank
+from quiz_engine import BankLoadError
+
+QUESTIONS = [{"question": f"Q{i}", "options": ["a", "b"], "correct": 0} for i in range(6)]
+TIPS = [{"title": f"Tip {i}", "description": "Listen first.", "education": "Reciprocity."} for i in range(4)]
+
+
+def _write_shard(root, name, records, bank="quiz"):
+    os.makedirs(os.path.join(root, bank), exist_ok=True)
+    with open(os.path.join(root, bank, name), "w", encoding="utf-8") as f:
+        json.dump(records, f)
+
+
+@pytest.fixture
+def pack(tmp_path):
+    root = str(tmp_path)
+    _write_shard(root, "quiz-000.json", QUESTIONS[:3])
+    _write_shard(root, "quiz-001.json", QUESTIONS[3:])
+    build_manifest(root)
+    pack = ContentPack(root)
+    pack.refresh()
+    return pack
+
+
+def _edit(pack, name, records):
+    _write_shard(pack.root, name, records)
+    build_manifest(pack.root)
+    return pack.refresh()
+
+
+def test_reload_keeps_parsed_shards_for_live_banks(pack):
+    old = pack.bank("quiz")
+    assert old[1]["question"] == "Q1"
+
+    assert _edit(pack, "quiz-000.json", [dict(q, question="edited") for q in QUESTIONS[:2]]) == {"quiz"}
+    new = pack.bank("quiz")
+    assert len(new) == 5 and new[1]["question"] == "edited"
+    assert old[1]["question"] == "Q1"  # the session that started before the edit is unchanged
+    assert old[4]["question"] == "Q4"  # untouched shards are still shared
+
+
+def test_unparsed_stale_shard_is_rejected_not_recached(pack):
+    old = pack.bank("quiz")
+    _edit(pack, "quiz-000.json", [dict(q, question="edited") for q in QUESTIONS[:3]])
+    with pytest.raises(BankLoadError):
+        old[0]
+    assert pack.bank("quiz")[0]["question"] == "edited"
+
+
+def test_tip_shard_edited_without_manifest_is_reported(tmp_path):
+    root = str(tmp_path)
+    _write_shard(root, "tips-000.json", TIPS[:2], bank="tips")
+    _write_shard(root, "tips-001.json", TIPS[2:], bank="tips")
+    build_manifest(root)
+    pack = ContentPack(root)
+    pack.refresh()
+    _write_shard(root, "tips-001.json", TIPS[2:] + TIPS[:1], bank="tips")  # manifest not rebuilt
+
+    (key, records, error, _), (index_key, index, index_error, _) = load_bank("tips", None, pack)
+    assert (key, records, index_key, index, index_error) == ("tips", [], "tip_index", None, None)
+    assert isinstance(error, BankLoadError)
@@ -0,0 +1,57 @@
+# Attention Dynamics - Near-duplicate lint tests
+
+import pytest
+
+import dedupe
+from dedupe import MinHashIndex, bank_clusters, item_text
+
+STEM = "Your partner forgets your birthday after a long and stressful week at work. "
+RECORDS = [
+    {"question": STEM + "What is the healthiest first response?", "options": ["Talk", "Sulk"]},
+    {"question": "You notice your date checking their phone repeatedly during dinner.",
+     "options": ["Ask", "Leave"]},
+    {"question": STEM + "What is the healthiest first reaction?", "options": ["Talk", "Sulk"]},
+]
+
+
+def test_reworded_pair_is_clustered_and_unrelated_item_is_not():
+    index = MinHashIndex()
+    index.sync("quiz", RECORDS)
+    assert index.clusters() == [["quiz:0", "quiz:2"]]
+    assert index.query(item_text(RECORDS[1])) == [("quiz:1", 1.0)]
+
+
+def test_sync_re_signs_only_edited_items():
+    index = MinHashIndex()
+    assert index.sync("quiz", RECORDS) == ["quiz:0", "quiz:1", "quiz:2"]
+    assert index.sync("quiz", RECORDS) == []
+
+    edited = [RECORDS[0], dict(RECORDS[1], question="Something else entirely, asked on a first date."),
+              RECORDS[2]]
+    assert index.sync("quiz", edited) == ["quiz:1"]
+    assert index.sync("quiz", edited[:2]) == [] and "quiz:2" not in index.ids  # dropped items leave
+    assert index.clusters() == []
+
+
+def test_save_load_round_trip(tmp_path):
+    path = str(tmp_path / "banks.lsh")
+    index = MinHashIndex()
+    index.sync("quiz", RECORDS)
+    index.remove("quiz:1")
+    index.save(path)
+
+    loaded = MinHashIndex.load(path)
+    assert sorted(loaded.ids) == ["quiz:0", "quiz:2"]
+    for key in loaded.ids:
+        assert loaded.signatures[loaded.ids[key]] == index.signatures[index.ids[key]]
+    assert loaded.clusters() == index.clusters()
+    assert bank_clusters("quiz", RECORDS, path) == [[0, 2]]
+
+
+def test_numpy_and_pure_python_signatures_match(monkeypatch):
+    pytest.importorskip("numpy")
+    index = MinHashIndex()
+    text = item_text(RECORDS[0])
+    vectorized = index.signature(text)
+    monkeypatch.setattr(dedupe, "np", None)
+    assert index.signature(text) == vectorized
@@ -0,0 +1,63 @@
+# Attention Dynamics - Bulk grading tests
+
+import io
+import json
+import os
+
+import pytest
+
+from content_pack import build_manifest
+from grade import grade_chunk, grade_sheet, load_banks, read_csv, read_jsonl
+from quiz_engine import QuestionBank
+
+BANKS = {"quiz": QuestionBank([{"question": "q", "options": ["a", "b"], "correct": 1, "explanation": ""}]),
+         "pda": QuestionBank([{"question": "q", "options": {"A": "a", "B": "b"}, "correct": "B"}])}
+
+
+def test_malformed_answers_are_reported_per_sheet():
+    result = grade_sheet({"id": "s", "kind": "quiz", "answers": [[0, 1], [0], None, [7, 1]]}, BANKS)
+    assert (result["score"], result["total"]) == (1, 1)
+    assert result["errors"] == ["malformed answer [0]", "malformed answer None", "unknown question 7"]
+
+
+def test_invalid_sheets_become_error_rows():
+    assert grade_sheet({"id": "s", "kind": ["pda"]}, BANKS)["errors"] == ["unknown sheet kind: ['pda']"]
+    assert grade_sheet([1, 2], BANKS)["errors"] == ["sheet must be a JSON object, got list"]
+    assert grade_sheet({"id": "s", "kind": "pda", "answers": 5}, BANKS)["total"] == 0
+
+
+def test_bad_json_line_does_not_stop_the_stream():
+    sheets = list(read_jsonl(io.StringIO('{"id": "a", "kind": "pda", "answers": [[0, "B"]]}\nnot json\n')))
+    assert sheets[1]["id"] == "line 2"
+    first, second = (grade_sheet(sheet, BANKS) for sheet in sheets)
+    assert first["score"] == 1
+    assert second["errors"][0].startswith("invalid JSON on line 2")
+
+
+def test_grade_chunk_survives_unexpected_errors():
+    # _BANKS is empty outside a worker process, so grading raises; the row still comes back
+    rows = grade_chunk([{"id": "x", "kind": "quiz", "answers": []}])
+    assert rows[0]["id"] == "x" and rows[0]["errors"]
+
+
+def test_csv_without_required_columns_is_rejected_up_front():
+    with pytest.raises(ValueError, match="missing id, answer"):
+        read_csv(io.StringIO("sheet,kind,question,reply\ns,quiz,0,1\n"))
+    sheets = list(read_csv(io.StringIO("id,kind,question,answer\ns,quiz,0,1\ns,quiz,0,0\n")))
+    assert sheets == [{"id": "s", "kind": "quiz", "answers": [("0", "1"), ("0", "0")]}]
+
+
+def test_banks_come_from_the_content_pack_when_present(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for kind, name in (("quiz", "quiz_questions.json"), ("pda", "PDA.json")):
+        records = [BANKS[kind][0]]
+        with open(name, "w", encoding="utf-8") as f:
+            json.dump(records, f)
+        os.makedirs(os.path.join("packs", kind))
+        with open(os.path.join("packs", kind, f"{kind}-000.json"), "w", encoding="utf-8") as f:
+            json.dump([dict(records[0], question="edited")] + records, f)  # shards were edited since
+    build_manifest()
+
+    banks = load_banks()
+    assert len(banks["quiz"]) == 2 and banks["quiz"][0]["question"] == "edited"
+    assert grade_sheet({"id": "s", "kind": "pda", "answers": [[1, "B"]]}, banks)["score"] == 1
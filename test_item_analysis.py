@@ -0,0 +1,17 @@
+# Attention Dynamics - Item analysis tests
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from item_analysis import distractor_analysis, from_arrays
+
+
+def test_fifth_option_does_not_spill_into_next_item():
+    # session, question, choice, correct: item 0 has a 5th option (index 4)
+    r = from_arrays([0, 0, 1, 1], [0, 1, 0, 1], [4, 0, 1, 0], [1, 0, 0, 1])
+    report = distractor_analysis(r)
+    assert report.counts.shape == (2, 5)
+    assert report.counts[0].tolist() == [0, 1, 0, 0, 1]
+    assert report.counts[1].tolist() == [2, 0, 0, 0, 0]
+    assert distractor_analysis(r, n_options=4).counts.shape == (2, 5)
@@ -0,0 +1,23 @@
+# Attention Dynamics - Bank loader tests
+# load_bank runs on the loader thread; whatever goes wrong, every bank it was
+# asked for must still reach the queue, or the app waits on it forever.
+
+import json
+
+from quiz import load_bank
+from quiz_engine import BankLoadError
+
+
+def test_malformed_tips_are_delivered_empty_with_the_error(tmp_path):
+    path = tmp_path / "tips.json"
+    path.write_text(json.dumps(["not a tip", 42]), encoding="utf-8")
+
+    (key, records, error, _), (index_key, index, _, _) = load_bank("tips", str(path))
+    assert (key, records, index_key, index) == ("tips", [], "tip_index", None)
+    assert isinstance(error, BankLoadError) and "tips" in str(error)
+
+
+def test_missing_bank_file_is_delivered_empty(tmp_path):
+    [(key, records, error, groups)] = load_bank("quiz", str(tmp_path / "missing.json"))
+    assert (key, records, groups) == ("quiz", [], ())
+    assert isinstance(error, BankLoadError)
@@ -0,0 +1,45 @@
+# Attention Dynamics - Latency histogram tests
+
+import random
+
+import pytest
+
+from profiling import MAX_VALUE, N_BUCKETS, SUB_BUCKETS, Histogram, bucket_index, bucket_value
+
+
+@pytest.mark.parametrize("value, idx, midpoint", [
+    (127, 127, 127),                 # last exact bucket
+    (128, 128, 128),                 # first log bucket, 2 values wide
+    (255, 191, 254),
+    (256, 192, 257),                 # next power of two, 4 values wide
+    (MAX_VALUE, N_BUCKETS - 1, (127 << 20) + ((1 << 20) - 1) // 2),
+])
+def test_bucket_boundaries(value, idx, midpoint):
+    assert bucket_index(value) == idx
+    assert bucket_value(idx) == midpoint
+
+
+def test_every_bucket_round_trips():
+    for idx in range(N_BUCKETS):
+        assert bucket_index(bucket_value(idx)) == idx
+
+
+def test_percentiles_stay_within_the_bucket_error():
+    rng = random.Random(7)
+    samples = [int(10 ** rng.uniform(0, 7)) for _ in range(5000)]
+    hist = Histogram()
+    for value in samples:
+        hist.record(value)
+    ordered = sorted(samples)
+    for pct in (1, 50, 90, 99, 99.9, 100):
+        exact = ordered[int(max(1, -(-len(ordered) * pct // 100))) - 1]
+        assert abs(hist.percentile(pct) - exact) <= exact / SUB_BUCKETS
+    assert (hist.min, hist.max, hist.count) == (ordered[0], ordered[-1], len(samples))
+
+
+def test_values_are_clamped():
+    hist = Histogram()
+    hist.record(-5)
+    hist.record(MAX_VALUE * 4)
+    assert (hist.min, hist.max) == (0, MAX_VALUE)
+    assert hist.percentile(100) == bucket_value(N_BUCKETS - 1)  # the top bucket's midpoint
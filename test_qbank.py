@@ -0,0 +1,69 @@
+# Attention Dynamics - Compiled question bank tests
+
+import json
+import os
+import struct
+
+import pytest
+
+from qbank import (KIND_PDA, KIND_QUIZ, KIND_TIPS, CompiledBank, compile_json, compiled_path,
+                   load_records)
+from quiz_engine import BankLoadError
+
+BANKS = {
+    KIND_QUIZ: [{"question": f"Q{i} — ünïcode", "options": ["Smile", "Frown", f"opt {i}"],
+                 "correct": i % 3, "explanation": "Warmth."} for i in range(5)],
+    KIND_PDA: [{"question": f"P{i}", "options": {"A": "Talk", "B": "Leave", "C": "Wait", "D": "Shout"},
+                "correct": "ABCD"[i % 4]} for i in range(5)],
+    KIND_TIPS: [{"title": f"Tip {i}", "description": "Listen.", "education": "Reciprocity."}
+                for i in range(5)],
+}
+
+
+def _write_json(path, records):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(records, f, ensure_ascii=False)
+
+
+@pytest.mark.parametrize("kind", sorted(BANKS))
+def test_compiled_bank_round_trips(tmp_path, kind):
+    records = BANKS[kind]
+    json_path = str(tmp_path / "bank.json")
+    _write_json(json_path, records)
+    bank = CompiledBank(compile_json(json_path))
+    try:
+        assert bank.kind == kind
+        assert len(bank) == len(records)
+        assert list(bank) == records
+        assert bank[-1] == records[-1] and bank[-len(records)] == records[0]
+        for idx in (len(records), -len(records) - 1):
+            with pytest.raises(IndexError):
+                bank[idx]
+    finally:
+        bank.close()
+
+
+def test_load_records_prefers_the_newer_file(tmp_path):
+    json_path = str(tmp_path / "bank.json")
+    _write_json(json_path, BANKS[KIND_QUIZ])
+    compile_json(json_path)
+    compiled = load_records(json_path)
+    assert isinstance(compiled, CompiledBank)
+    compiled.close()
+
+    edited = BANKS[KIND_QUIZ][:2]
+    _write_json(json_path, edited)
+    newer = os.path.getmtime(compiled_path(json_path)) + 10
+    os.utime(json_path, (newer, newer))
+    assert load_records(json_path) == edited
+
+
+@pytest.mark.parametrize("header", [b"XXXX" + struct.pack("<H", 1), b"ADQB" + struct.pack("<H", 99)])
+def test_wrong_magic_or_version_is_rejected(tmp_path, header):
+    json_path = str(tmp_path / "bank.json")
+    _write_json(json_path, BANKS[KIND_TIPS])
+    path = compile_json(json_path)
+    with open(path, "r+b") as f:
+        f.write(header)
+    with pytest.raises(BankLoadError):
+        CompiledBank(path)
@@ -0,0 +1,72 @@
+# Attention Dynamics - Headless quiz engine tests
+# The expected texts are the ones the tabs showed before the engine existed.
+
+import random
+
+import pytest
+
+from quiz_engine import (PdaSession, QuestionBank, QuizSession, grade_pda, grade_quiz, pda_result,
+                         quiz_result)
+
+QUIZ_Q = {"question": "Q", "options": ["Smile", "Frown", "Ignore"], "correct": 0,
+          "explanation": "Smiling signals warmth."}
+PDA_Q = {"question": "P", "options": {"A": "Talk it through", "B": "Walk away"}, "correct": "A"}
+
+
+def test_grade_quiz_messages():
+    assert grade_quiz(QUIZ_Q, 0) == (True, "POSITIVE RESPONSE CONFIRMED ✓\n\nSmiling signals warmth.")
+    assert grade_quiz(QUIZ_Q, 2) == (False, "NEGATIVE MATCH\nCorrect vector: Smile\n\nSmiling signals warmth.")
+
+
+def test_grade_pda_messages():
+    assert grade_pda(PDA_Q, "A") == (True, "POSITIVE RESPONSE CONFIRMED ✓\n\nCorrect choice: A. Talk it through")
+    assert grade_pda(PDA_Q, "B") == (False, "NEGATIVE MATCH\nCorrect choice: A. Talk it through")
+
+
+@pytest.mark.parametrize("score, band", [(85, "EXCELLENT PROTOCOL MASTERY"), (84, "ACCEPTABLE PERFORMANCE"),
+                                         (60, "ACCEPTABLE PERFORMANCE"), (59, "SIGNIFICANT RECALIBRATION")])
+def test_quiz_result_band_edges(score, band):
+    result = quiz_result(score, 100)
+    assert result.percent == score
+    assert result.message.startswith(f"EVALUATION COMPLETE\n\nSCORE: {score}/100  ({score:.1f}%)\n\n{band}")
+
+
+@pytest.mark.parametrize("score, band", [(16, "strong indicators"), (15, "potential for a healthy"),
+                                         (12, "potential for a healthy"), (11, "Significant self-reflection")])
+def test_pda_result_band_edges(score, band):
+    result = pda_result(score, 20)  # 80% and 60% sit exactly on 16 and 12
+    assert result.message.startswith(f"PDA EVALUATION COMPLETE\n\nSCORE: {score}/20  ({score * 5:.1f}%)\n\n")
+    assert band in result.message
+
+
+def test_empty_result_is_zero_percent():
+    assert quiz_result(0, 0).percent == 0
+
+
+def test_quiz_start_rejects_counts_outside_the_bank():
+    bank = QuestionBank([QUIZ_Q] * 5)
+    for count in (0, 6):
+        with pytest.raises(ValueError, match="between 1 and 5"):
+            QuizSession.start(bank, count)
+    assert len(QuizSession.start(bank, 5, random.Random(0))) == 5
+
+
+def test_pda_start_needs_twenty_questions():
+    with pytest.raises(ValueError, match=r"need 20"):
+        PdaSession.start(QuestionBank([PDA_Q] * 19))
+    assert len(PdaSession.start(QuestionBank([PDA_Q] * 20), rng=random.Random(0))) == 20
+
+
+def test_answering_twice_raises():
+    session = QuizSession.start(QuestionBank([QUIZ_Q] * 3), 2, random.Random(0))
+    assert session.check(0).is_correct
+    with pytest.raises(RuntimeError):
+        session.check(1)
+    assert session.score == 1
+    session.advance()
+    session.check(1)
+    session.advance()
+    assert session.finished
+    with pytest.raises(RuntimeError):
+        session.check(0)
+    assert session.result()[:2] == (1, 2)
@@ -0,0 +1,53 @@
+# Attention Dynamics - Response log tests
+
+from response_log import KIND_PDA, KIND_QUIZ, RECORD, ResponseLog, read_records
+
+ANSWERS = [(KIND_QUIZ, 3, 1, True), (KIND_QUIZ, 3, 2, False), (KIND_PDA, 3, 0, True),
+           (KIND_QUIZ, 7, 5, False), (KIND_PDA, 0, 3, False)]
+
+
+def _write_log(path):
+    log = ResponseLog(path, batch_size=2)
+    for i, (kind, question, choice, is_correct) in enumerate(ANSWERS):
+        session_id = log.next_session_id() if i % 2 == 0 else log._last_session
+        log.append(kind, session_id, question, choice, is_correct)
+    log.close()
+    return log
+
+
+def test_replay_reproduces_stats_and_session_ids(tmp_path):
+    path = str(tmp_path / "responses.log")
+    written = _write_log(path)
+
+    replayed = ResponseLog(path)
+    assert replayed.replay() == len(ANSWERS)
+    replayed.close()
+    for kind, question, _, _ in ANSWERS:
+        assert replayed.stats(kind, question) == written.stats(kind, question)
+    assert written.stats(KIND_QUIZ, 3) == (2, 1, 0.5, (0, 1, 1, 0))
+    assert replayed.next_session_id() == written.next_session_id() == 4
+
+
+def test_streak_is_the_run_of_correct_answers(tmp_path):
+    log = ResponseLog(str(tmp_path / "responses.log"))
+    for is_correct in (True, True, False, True, True, True):
+        log.append(KIND_QUIZ, 1, 4, 0, is_correct)
+    log.close()
+    assert log.streak(KIND_QUIZ, 4) == 3
+    assert log.streak(KIND_PDA, 4) == log.streak(KIND_QUIZ, 5) == 0
+
+    replayed = ResponseLog(log.path)
+    replayed.replay()
+    replayed.close()
+    assert replayed.streak(KIND_QUIZ, 4) == 3
+
+
+def test_read_records_ignores_a_torn_tail(tmp_path):
+    path = str(tmp_path / "responses.log")
+    _write_log(path)
+    with open(path, "ab") as f:
+        f.write(RECORD.pack(0.0, 9, 9, KIND_QUIZ, 0, True)[:RECORD.size // 2])  # crash mid-write
+
+    records = list(read_records(path))
+    assert [(r.kind, r.question, r.choice, r.is_correct) for r in records] == ANSWERS
+    assert [r.session_id for r in records] == [1, 1, 2, 2, 3]
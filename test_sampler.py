@@ -0,0 +1,91 @@
+# Attention Dynamics - Weighted sampler tests
+
+import random
+
+import pytest
+
+from sampler import BOX_WEIGHTS, MAX_BOX, FenwickTree, WeightedSampler
+
+
+def test_fenwick_prefix_matches_running_sum():
+    rng = random.Random(3)
+    weights = [rng.randrange(10) for _ in range(37)]
+    tree = FenwickTree(weights)
+    for idx in range(len(weights) + 1):
+        assert tree.prefix(idx) == sum(weights[:idx])
+
+    tree.add(5, 7)
+    weights[5] += 7
+    assert tree.total() == sum(weights)
+    assert tree.prefix(6) == sum(weights[:6])
+
+
+def test_fenwick_find_returns_owning_index():
+    weights = [3, 0, 2, 5, 0, 1]
+    tree = FenwickTree(weights)
+    expected = [i for i, w in enumerate(weights) for _ in range(w)]
+    assert [tree.find(target) for target in range(tree.total())] == expected
+
+
+def test_seeded_samplers_are_reproducible():
+    a, b = WeightedSampler(500, seed=42), WeightedSampler(500, seed=42)
+    for _ in range(5):
+        assert a.sample(20) == b.sample(20)
+    assert WeightedSampler(500, seed=43).sample(20) != WeightedSampler(500, seed=42).sample(20)
+
+
+def test_sample_is_distinct_and_restores_weights():
+    sampler = WeightedSampler(50, seed=1)
+    for idx in range(0, 50, 3):
+        sampler.record(idx, True)
+    weights = list(sampler.weights)
+    total = sampler.tree.total()
+
+    drawn = sampler.sample(50)
+    assert sorted(drawn) == list(range(50))
+    assert sampler.weights == weights
+    assert sampler.tree.total() == total
+    assert [sampler.tree.prefix(i + 1) - sampler.tree.prefix(i) for i in range(50)] == weights
+
+
+def test_record_moves_between_boxes():
+    sampler = WeightedSampler(3, seed=0)
+    for _ in range(MAX_BOX + 2):
+        sampler.record(0, True)
+    assert sampler.weight(0) == BOX_WEIGHTS[MAX_BOX]
+    sampler.record(0, False)
+    assert sampler.weight(0) == BOX_WEIGHTS[0]
+
+
+def test_sample_never_draws_two_cluster_members():
+    sampler = WeightedSampler(10, seed=5)
+    sampler.set_clusters([[0, 1, 2], [3, 4]])
+    for _ in range(50):
+        drawn = set(sampler.sample(5))
+        assert len(drawn & {0, 1, 2}) <= 1
+        assert len(drawn & {3, 4}) <= 1
+
+
+def test_sample_rejects_impossible_counts():
+    sampler = WeightedSampler(4, seed=0)
+    with pytest.raises(ValueError):
+        sampler.sample(5)
+    sampler.set_clusters([[0, 1, 2, 3]])
+    with pytest.raises(ValueError):
+        sampler.sample(2)
+    assert sampler.tree.total() == sum(sampler.weights)  # restored after the failed draw
+
+
+def test_set_boxes_matches_recorded_answers():
+    recorded = WeightedSampler(6, seed=0)
+    for idx, answers in enumerate([[], [True], [True] * 9, [True, False], [False, True, True], [True] * 3]):
+        for is_correct in answers:
+            recorded.record(idx, is_correct)
+    restored = WeightedSampler(6, seed=0)
+    restored.set_boxes([0, 1, 9, 0, 2, 3])  # runs of correct answers; 9 caps at MAX_BOX
+    assert restored.boxes == recorded.boxes
+    assert restored.weights == recorded.weights
+    assert restored.tree.total() == sum(recorded.weights)
+    assert restored.sample(6) == recorded.sample(6)
+    with pytest.raises(ValueError):
+        restored.set_boxes([0, 1])
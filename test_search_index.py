@@ -0,0 +1,54 @@
+# Attention Dynamics - Protocol search index tests
+
+import json
+import os
+
+from search_index import SearchIndex, index_path, load_or_build
+
+TIPS = [
+    {"title": "Active Listening", "description": "Ask follow-up questions.", "education": "Reciprocity."},
+    {"title": "Positive Body Language", "description": "Open posture and listening cues.",
+     "education": "Mirroring creates rapport."},
+    {"title": "Use Light Humor", "description": "Playful teasing.", "education": "Humor reduces tension."},
+    {"title": "Read Social Cues", "description": "Notice posture and tone.", "education": "Emotional intelligence."},
+]
+
+
+def test_add_matches_a_full_build():
+    built = SearchIndex.build(TIPS)
+    grown = SearchIndex.build(TIPS[:1])
+    for tip in TIPS[1:]:
+        grown.add(tip)
+    assert (grown.postings, grown.terms, grown.doc_len, grown.total_len) == \
+           (built.postings, built.terms, built.doc_len, built.total_len)
+    assert grown.search("posture listening") == built.search("posture listening")
+
+
+def test_last_word_is_a_prefix():
+    index = SearchIndex.build(TIPS)
+    assert [doc for doc, _ in index.search("hum")] == [2]
+    # Only the last word is expanded: a leading "hum" matches nothing by itself
+    assert index.search("hum tension") == index.search("tension")
+    assert index.search("tension hum")[0][1] > index.search("tension")[0][1]
+
+
+def test_title_hits_rank_first():
+    index = SearchIndex.build(TIPS)
+    ranked = [doc for doc, _ in index.search("listening")]
+    assert ranked == [0, 1]  # title match beats a description match
+
+
+def test_saved_index_is_reused_until_the_source_changes(tmp_path):
+    json_path = str(tmp_path / "tips.json")
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(TIPS, f)
+    built = load_or_build(json_path, TIPS)
+    assert os.path.exists(index_path(json_path))
+
+    loaded = SearchIndex.load(index_path(json_path), json_path)
+    assert loaded.postings == built.postings
+    assert loaded.search("cues") == built.search("cues")
+
+    with open(json_path, "a", encoding="utf-8") as f:
+        f.write("\n")
+    assert SearchIndex.load(index_path(json_path), json_path) is None
@@ -0,0 +1,58 @@
+# Attention Dynamics - Quiz server tests
+
+import asyncio
+import json
+
+import pytest
+
+from server import HttpError, QuizServer, serve
+
+QUIZ = [{"question": f"Q{i}", "options": ["a", "b", "c"], "correct": 0} for i in range(5)]
+PDA = [{"question": f"P{i}", "options": {"A": "yes", "B": "no"}, "correct": "A"} for i in range(25)]
+
+
+@pytest.fixture
+def server():
+    return QuizServer({"tips": iter(["tip one", "tip two"]), "quiz": QUIZ, "pda": PDA})
+
+
+def test_unhashable_kind_is_a_bad_request(server):
+    with pytest.raises(HttpError) as e:
+        server.dispatch("POST", "/sessions", {"kind": ["pda"]})
+    assert e.value.status == 400
+
+
+def test_non_string_pda_choice_is_a_bad_request(server):
+    _, state = server.dispatch("POST", "/sessions", {"kind": "pda"})
+    with pytest.raises(HttpError) as e:
+        server.dispatch("POST", f"/sessions/{state['session']}/answer", {"choice": ["A"]})
+    assert e.value.status == 400
+    status, feedback = server.dispatch("POST", f"/sessions/{state['session']}/answer", {"choice": "A"})
+    assert status == 200 and feedback["is_correct"]
+
+
+def test_tips_are_listed_once(server):
+    assert server.dispatch("GET", "/tips", {}) == (200, ["tip one", "tip two"])
+    assert server.dispatch("GET", "/tips", {})[1] is server.tips
+
+
+def test_unexpected_error_gets_a_500_reply(server, monkeypatch):
+    def broken(method, path, body):
+        raise KeyError("bug")
+    monkeypatch.setattr(server, "dispatch", broken)
+
+    async def request():
+        bound = asyncio.get_running_loop().create_future()
+        task = asyncio.ensure_future(serve(server, "127.0.0.1", 0, bound.set_result))
+        host, port = await bound
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(b"GET /banks HTTP/1.1\r\nHost: test\r\n\r\n")
+        status = await reader.readline()
+        body = (await reader.read()).split(b"\r\n\r\n", 1)[1]
+        writer.close()
+        task.cancel()
+        return status, json.loads(body)
+
+    status, body = asyncio.run(request())
+    assert status.startswith(b"HTTP/1.1 500 ")
+    assert body == {"error": "internal server error"}